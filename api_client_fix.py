@@ -2,6 +2,23 @@
 Fix for the API client to ensure it correctly reads the API key from .env
 This is a patch that you can apply to your api_client.py file
 """
+import os
+
+from anthropic import Anthropic
+from dotenv import load_dotenv
+
+from config.settings import ENV_PATH
+
+# Load the project's .env file once, when the patch is imported, rather than
+# on every client construction
+load_dotenv(dotenv_path=ENV_PATH)
+
+# Bound once so each lookup skips the os.getenv wrapper
+_ENV_GET = os.environ.get
+
+# Anthropic clients shared per API key, so re-created API clients keep
+# using the same HTTP connection pool
+_CLIENT_CACHE = {}
 
 # Here's a corrected version of the init method that should fix the API key issue.
 # Replace the __init__ method in your src/api_client.py file with this:
@@ -14,25 +31,13 @@ def __init__(self, api_key=None):
         api_key (str, optional): Claude API key. If not provided, it will be read from
                                  the environment variable or .env file.
     """
-    # Try to load from .env file explicitly
-    from dotenv import load_dotenv
-    import os
-    from pathlib import Path
-    
-    # Get the project root directory
-    project_root = Path(__file__).resolve().parent.parent
-    env_path = project_root / '.env'
-    
-    # Load the .env file
-    load_dotenv(dotenv_path=env_path)
-    
     # Try different ways to get the API key
     if api_key:
         self.api_key = api_key
     else:
         # Try various environment variable names that might contain the API key
-        self.api_key = (os.getenv('CLAUDE_API_KEY') or 
-                        os.getenv('ANTHROPIC_API_KEY'))
+        self.api_key = (_ENV_GET('CLAUDE_API_KEY') or 
+                        _ENV_GET('ANTHROPIC_API_KEY'))
     
     # Verify that we have an API key
     if not self.api_key:
@@ -41,6 +46,22 @@ def __init__(self, api_key=None):
             "environment variable in your .env file."
         )
     
-    # Initialize the Anthropic client
-    self.client = Anthropic(api_key=self.api_key)
-    self.model = os.getenv('CLAUDE_MODEL', 'claude-3-7-sonnet-20250219')
\ No newline at end of file
+    # Reuse the Anthropic client for this key, creating it on first use
+    self.client = _CLIENT_CACHE.get(self.api_key)
+    if self.client is None:
+        self.client = _CLIENT_CACHE.setdefault(self.api_key, Anthropic(api_key=self.api_key))
+    self.model = _ENV_GET('CLAUDE_MODEL', 'claude-3-7-sonnet-20250219')
+
+# Call this when done with a key, e.g. from the client's close method, to
+# release the shared connection pool:
+
+def close_client(api_key):
+    """
+    Close the shared Anthropic client used for an API key.
+    
+    Args:
+        api_key (str): The API key the client was created for.
+    """
+    client = _CLIENT_CACHE.pop(api_key, None)
+    if client is not None:
+        client.close()
@@ -2,7 +2,11 @@
 Configuration settings for supported AI models.
 Defines available models for each provider and their settings.
 """
-from typing import Dict, List, Any
+import sys
+import textwrap
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
 
 # Available model providers
 PROVIDERS = {
@@ -90,6 +94,9 @@ DEFAULT_SYSTEM_PROMPTS = {
     """
 }
 
+# Remove the source indentation and surrounding blank lines once at import time
+DEFAULT_SYSTEM_PROMPTS = {k: textwrap.dedent(v).strip() for k, v in DEFAULT_SYSTEM_PROMPTS.items()}
+
 # Provider-specific settings (like API endpoints, rate limits, etc.)
 PROVIDER_SETTINGS = {
     "claude": {
@@ -113,19 +120,37 @@ PROVIDER_SETTINGS = {
     }
 }
 
-def get_models_for_provider(provider: str) -> List[Dict[str, Any]]:
+# The tables above are read-only; expose them as immutable views with interned
+# provider keys so cached lookups can safely hold on to them. The model lists
+# become tuples of read-only mappings, since the getters below hand the same
+# objects to every caller
+PROVIDERS = MappingProxyType({sys.intern(k): v for k, v in PROVIDERS.items()})
+MODELS = MappingProxyType(
+    {sys.intern(k): tuple(MappingProxyType(m) for m in v) for k, v in MODELS.items()}
+)
+PROVIDER_SETTINGS = MappingProxyType(
+    {sys.intern(k): MappingProxyType(v) for k, v in PROVIDER_SETTINGS.items()}
+)
+
+# Lookup indexes built once from MODELS
+_MODEL_INDEX = {(p, m["id"]): m for p, ms in MODELS.items() for m in ms}
+_DEFAULTS = {p: ms[0]["id"] for p, ms in MODELS.items() if ms}
+
+@lru_cache(maxsize=32)
+def get_models_for_provider(provider: str) -> Tuple[Mapping[str, Any], ...]:
     """
-    Get the list of available models for a provider.
+    Get the available models for a provider.
     
     Args:
         provider: The provider name
         
     Returns:
-        List of model information dictionaries
+        Tuple of read-only model information mappings
     """
     provider = provider.lower()
-    return MODELS.get(provider, [])
+    return MODELS.get(provider, ())
 
+@lru_cache(maxsize=32)
 def get_default_model_for_provider(provider: str) -> str:
     """
     Get the default model ID for a provider.
@@ -136,10 +161,22 @@ def get_default_model_for_provider(provider: str) -> str:
     Returns:
         Default model ID
     """
-    provider = provider.lower()
-    models = get_models_for_provider(provider)
-    return models[0]["id"] if models else ""
+    return _DEFAULTS.get(provider.lower(), "")
+
+def get_model(provider: str, model_id: str) -> Optional[Mapping[str, Any]]:
+    """
+    Get the information for a single model of a provider.
+    
+    Args:
+        provider: The provider name
+        model_id: The model ID
+        
+    Returns:
+        Read-only model information mapping, or None if the model is unknown
+    """
+    return _MODEL_INDEX.get((provider.lower(), model_id))
 
+@lru_cache(maxsize=32)
 def get_system_prompt_for_provider(provider: str) -> str:
     """
     Get the default system prompt for a provider.
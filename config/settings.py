@@ -2,19 +2,35 @@
 Configuration settings for the AI Programming Assistant.
 """
 import os
+import re
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Get the project root directory
-project_root = Path(__file__).resolve().parent.parent
-env_path = project_root / '.env'
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ENV_PATH = PROJECT_ROOT / '.env'
 
 # Load environment variables from .env file if present
-load_dotenv(dotenv_path=env_path)
+load_dotenv(dotenv_path=ENV_PATH)
+
+# Snapshot of the environment taken once after the .env file is loaded
+_ENV = dict(os.environ)
 
 # API settings - check for both environment variable names
-ANTHROPIC_API_KEY = os.getenv("CLAUDE_API_KEY") or os.getenv("ANTHROPIC_API_KEY")
-DEFAULT_MODEL = os.getenv("CLAUDE_MODEL", "claude-3-sonnet-20240229")
+ANTHROPIC_API_KEY = _ENV.get("CLAUDE_API_KEY") or _ENV.get("ANTHROPIC_API_KEY")
+DEFAULT_MODEL = _ENV.get("CLAUDE_MODEL", "claude-3-sonnet-20240229")
+
+
+def refresh_environment_cache():
+    """
+    Re-read the environment and update the settings derived from it.
+    
+    Useful for tests or scripts that change environment variables after import.
+    """
+    global _ENV, ANTHROPIC_API_KEY, DEFAULT_MODEL
+    _ENV = dict(os.environ)
+    ANTHROPIC_API_KEY = _ENV.get("CLAUDE_API_KEY") or _ENV.get("ANTHROPIC_API_KEY")
+    DEFAULT_MODEL = _ENV.get("CLAUDE_MODEL", "claude-3-sonnet-20240229")
 
 # System settings
 MAX_HISTORY_LENGTH = 20  # Maximum number of messages to keep in conversation history
@@ -36,23 +52,33 @@ CLI_COLORS = {
 
 # Task templates for beginners
 BEGINNER_TEMPLATES = {
-    "file_read": "# Template for reading a file\n"
-                "# This code reads the contents of a file and prints it\n\n"
-                "file_path = 'your_file.txt'  # Change this to your file's path\n\n"
-                "# Open the file and read its contents\n"
-                "with open(file_path, 'r') as file:\n"
-                "    content = file.read()\n\n"
-                "# Print the file contents\n"
-                "print(content)\n",
-                
-    "file_write": "# Template for writing to a file\n"
-                 "# This code writes text to a file\n\n"
-                 "file_path = 'output.txt'  # The file to write to\n"
-                 "content = 'This is the text that will be written to the file.'\n\n"
-                 "# Open the file in write mode and write the content\n"
-                 "with open(file_path, 'w') as file:\n"
-                 "    file.write(content)\n\n"
-                 "print(f'Content written to {file_path}')\n"
+    "file_read": """\
+# Template for reading a file
+# This code reads the contents of a file and prints it
+
+file_path = 'your_file.txt'  # Change this to your file's path
+
+# Open the file and read its contents
+with open(file_path, 'r') as file:
+    content = file.read()
+
+# Print the file contents
+print(content)
+""",
+    
+    "file_write": """\
+# Template for writing to a file
+# This code writes text to a file
+
+file_path = 'output.txt'  # The file to write to
+content = 'This is the text that will be written to the file.'
+
+# Open the file in write mode and write the content
+with open(file_path, 'w') as file:
+    file.write(content)
+
+print(f'Content written to {file_path}')
+"""
 }
 
 # Task analysis helpers - keywords to identify task types
@@ -63,4 +89,36 @@ TASK_KEYWORDS = {
     "ui_creation": ["ui", "interface", "gui", "button", "window", "form", "display"],
     "automation": ["schedule", "automate", "repeat", "daily", "trigger", "cron"],
     "calculation": ["calculate", "math", "compute", "average", "sum", "statistics"]
-}
\ No newline at end of file
+}
+
+# Keyword -> categories map and a single pattern matching every keyword, so a
+# task is classified in one scan of its text. The lookahead lets matches
+# overlap; only the longest keyword is reported at each position, so each
+# keyword also carries the categories of any keyword that is its prefix.
+_KEYWORD_CATEGORIES = {}
+for _category, _keywords in TASK_KEYWORDS.items():
+    for _keyword in _keywords:
+        _KEYWORD_CATEGORIES.setdefault(_keyword, set()).add(_category)
+_KEYWORD_CATEGORIES = {
+    keyword: set().union(*(cats for other, cats in _KEYWORD_CATEGORIES.items() if keyword.startswith(other)))
+    for keyword in _KEYWORD_CATEGORIES
+}
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)) + "))"
+)
+
+
+def classify_task(text):
+    """
+    Find the task categories whose keywords appear in a task description.
+    
+    Args:
+        text: The task description.
+        
+    Returns:
+        Set of matching category names from TASK_KEYWORDS.
+    """
+    categories = set()
+    for match in _KEYWORD_PATTERN.finditer(text.lower()):
+        categories |= _KEYWORD_CATEGORIES[match.group(1)]
+    return categories
@@ -7,10 +7,42 @@ This script:
 4. Creates a .env file from template if it doesn't exist
 """
 import os
+import py_compile
 import shutil
 from pathlib import Path
 import sys
 
+# Name defined by the current lazy client factory; an __init__.py that has it
+# is newer than the one this script writes and is left in place
+CLIENT_FACTORY_MARKER = "_CLIENT_CLASSES"
+
+# Multi-model section added to the README, and the heading used to detect it
+MULTI_MODEL_MARKER = "## Multi-Model Support"
+MULTI_MODEL_SECTION = '''
+## Multi-Model Support
+
+The AI Programming Assistant now supports multiple AI model providers, allowing you to choose the best AI model for your needs.
+
+### Supported Providers
+
+- **Claude (Anthropic)**: Claude 3 Opus, Claude 3 Sonnet, Claude 3 Haiku
+- **OpenAI**: GPT-4o, GPT-4 Turbo, GPT-3.5 Turbo
+- **Google Gemini**: Gemini 1.5 Pro, Gemini 1.5 Flash
+- **Hugging Face**: Mixtral 8x7B, Llama 3 70B, Phi-3 Mini
+- **Grok (xAI)**: Grok-1
+- **Deepseek**: Deepseek Coder, Deepseek Chat
+
+### Setting Up API Keys
+
+To use the different AI models, you'll need to provide the respective API keys:
+
+1. Rename `.env.template` to `.env` in the project root directory
+2. Add your API keys for the providers you want to use
+3. Alternatively, use the "Set API Key" button in the UI to configure keys
+
+The application will automatically store your API keys in the `.env` file.
+'''
+
 def main():
     """Run the installation process."""
     print("Installing multi-model support for AI Programming Assistant...")
@@ -37,32 +69,45 @@ def main():
     print("Creating API client files...")
     
     # Create __init__.py in api_clients
-    with open(api_clients_dir / "__init__.py", 'w') as f:
-        f.write('"""API clients for various AI model providers."""\n')
-        f.write('from .base_client import BaseAPIClient\n')
-        f.write('from .claude_client import ClaudeAPIClient\n')
-        f.write('from .openai_client import OpenAIAPIClient\n')
-        f.write('from .gemini_client import GeminiAPIClient\n')
-        f.write('from .huggingface_client import HuggingFaceAPIClient\n')
-        f.write('from .grok_client import GrokAPIClient\n')
-        f.write('from .deepseek_client import DeepseekAPIClient\n\n')
-        f.write('def create_api_client(provider, api_key=None):\n')
-        f.write('    """Factory function to create API clients."""\n')
-        f.write('    provider = provider.lower()\n')
-        f.write('    if provider == "claude" or provider == "anthropic":\n')
-        f.write('        return ClaudeAPIClient(api_key)\n')
-        f.write('    elif provider == "openai":\n')
-        f.write('        return OpenAIAPIClient(api_key)\n')
-        f.write('    elif provider == "gemini" or provider == "google":\n')
-        f.write('        return GeminiAPIClient(api_key)\n')
-        f.write('    elif provider == "huggingface":\n')
-        f.write('        return HuggingFaceAPIClient(api_key)\n')
-        f.write('    elif provider == "grok":\n')
-        f.write('        return GrokAPIClient(api_key)\n')
-        f.write('    elif provider == "deepseek":\n')
-        f.write('        return DeepseekAPIClient(api_key)\n')
-        f.write('    else:\n')
-        f.write('        raise ValueError(f"Unsupported provider: {provider}")\n')
+    init_content = (
+        '"""API clients for various AI model providers."""\n'
+        'from .base_client import BaseAPIClient\n'
+        'from .claude_client import ClaudeAPIClient\n'
+        'from .openai_client import OpenAIAPIClient\n'
+        'from .gemini_client import GeminiAPIClient\n'
+        'from .huggingface_client import HuggingFaceAPIClient\n'
+        'from .grok_client import GrokAPIClient\n'
+        'from .deepseek_client import DeepseekAPIClient\n\n'
+        '_CLIENTS = {\n'
+        '    "claude": ClaudeAPIClient,\n'
+        '    "anthropic": ClaudeAPIClient,\n'
+        '    "openai": OpenAIAPIClient,\n'
+        '    "gemini": GeminiAPIClient,\n'
+        '    "google": GeminiAPIClient,\n'
+        '    "huggingface": HuggingFaceAPIClient,\n'
+        '    "grok": GrokAPIClient,\n'
+        '    "deepseek": DeepseekAPIClient,\n'
+        '}\n\n'
+        'def create_api_client(provider, api_key=None):\n'
+        '    """Factory function to create API clients."""\n'
+        '    provider = provider.lower()\n'
+        '    client_class = _CLIENTS.get(provider)\n'
+        '    if client_class is None:\n'
+        '        raise ValueError(f"Unsupported provider: {provider}")\n'
+        '    return client_class(api_key)\n'
+    )
+    init_path = api_clients_dir / "__init__.py"
+    
+    # Skip the rewrite if the package already has the lazy factory, which also
+    # takes a cache and provides multi_query, ProviderError and close_session
+    if init_path.exists() and CLIENT_FACTORY_MARKER in init_path.read_text():
+        print("API client package is already up to date, skipping __init__.py.")
+    else:
+        with open(init_path, 'w') as f:
+            f.write(init_content)
+        
+        # Byte-compile the generated module so the first run can load it from the cache
+        py_compile.compile(str(init_path), doraise=True)
     
     # Create individual client files
     # (Code omitted as it's already provided in the previous messages)
@@ -96,40 +141,18 @@ def main():
         with open(readme_path, 'r') as f:
             readme_content = f.read()
         
-        # Add multi-model section
-        multi_model_section = '''
-## Multi-Model Support
-
-The AI Programming Assistant now supports multiple AI model providers, allowing you to choose the best AI model for your needs.
-
-### Supported Providers
-
-- **Claude (Anthropic)**: Claude 3 Opus, Claude 3 Sonnet, Claude 3 Haiku
-- **OpenAI**: GPT-4o, GPT-4 Turbo, GPT-3.5 Turbo
-- **Google Gemini**: Gemini 1.5 Pro, Gemini 1.5 Flash
-- **Hugging Face**: Mixtral 8x7B, Llama 3 70B, Phi-3 Mini
-- **Grok (xAI)**: Grok-1
-- **Deepseek**: Deepseek Coder, Deepseek Chat
-
-### Setting Up API Keys
-
-To use the different AI models, you'll need to provide the respective API keys:
-
-1. Rename `.env.template` to `.env` in the project root directory
-2. Add your API keys for the providers you want to use
-3. Alternatively, use the "Set API Key" button in the UI to configure keys
-
-The application will automatically store your API keys in the `.env` file.
-'''
-        
-        # Add the section after the Features section
-        if "## Features" in readme_content:
-            new_readme = readme_content.replace("## Requirements", f"{multi_model_section}\n\n## Requirements")
+        # Skip the rewrite if a previous install already added the section
+        if MULTI_MODEL_MARKER in readme_content:
+            print("README already contains multi-model information, skipping.")
         else:
-            new_readme = f"{readme_content}\n{multi_model_section}"
-        
-        with open(readme_path, 'w') as f:
-            f.write(new_readme)
+            # Add the section after the Features section
+            if "## Features" in readme_content:
+                new_readme = readme_content.replace("## Requirements", f"{MULTI_MODEL_SECTION}\n\n## Requirements")
+            else:
+                new_readme = f"{readme_content}\n{MULTI_MODEL_SECTION}"
+            
+            with open(readme_path, 'w') as f:
+                f.write(new_readme)
     
     print("\nInstallation complete! The AI Programming Assistant now supports multiple AI models.")
     print("\nAvailable providers:")
@@ -4,23 +4,91 @@ Main entry point for the application
 """
 import sys
 import os
+import mmap
 import argparse
-from src.assistant import ProgrammingAssistant
-from ui.interface import CommandLineInterface
+from functools import lru_cache
 from config.model_config import get_default_model_for_provider
 
 
-def parse_arguments():
+def _assistant_cls():
+    """Import the assistant only once a mode that needs it has been chosen."""
+    from src.assistant import ProgrammingAssistant
+    return ProgrammingAssistant
+
+
+@lru_cache(maxsize=None)
+def _get_assistant(provider, model):
+    """Create the assistant for a provider and model, reusing earlier instances."""
+    return _assistant_cls()(provider=provider, model=model)
+
+
+def _start_interactive_session(assistant):
+    """Start the command-line interface, importing it only when it is used."""
+    from ui.interface import CommandLineInterface
+    ui = CommandLineInterface(assistant)
+    ui.start_interactive_session()
+
+
+# Files at least this large are memory-mapped rather than read in one call
+_MMAP_THRESHOLD = 1024 * 1024
+
+
+def _read_source_file(path):
+    """
+    Read a source file for analysis with as few copies and syscalls as possible.
+    
+    Small files are read with a single os.read sized from fstat and decoded
+    once; large files are decoded straight from a read-only memory map.
+    
+    Raises:
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        size = os.fstat(fd).st_size
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, 'utf-8')
+        else:
+            chunks = []
+            remaining = size
+            # os.read may return fewer bytes than asked for, so keep reading
+            while remaining > 0:
+                chunk = os.read(fd, remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            text = b"".join(chunks).decode('utf-8')
+    finally:
+        os.close(fd)
+    
+    # Normalize \r\n and lone \r line endings the way text-mode reads do
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+# Argument parser, built on first use and reused by later calls
+_PARSER = None
+
+
+def _get_parser():
+    """Return the command line argument parser, creating it on first use."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = argparse.ArgumentParser(description="AI Programming Assistant")
+        _PARSER.add_argument("--interactive", action="store_true", help="Start in interactive mode")
+        _PARSER.add_argument("--gui", action="store_true", help="Start with graphical user interface")
+        _PARSER.add_argument("--provider", type=str, default="claude", help="AI provider to use")
+        _PARSER.add_argument("--model", type=str, help="Specific model to use")
+        _PARSER.add_argument("--query", type=str, help="Single query to the assistant")
+        _PARSER.add_argument("--task", type=str, help="Task description to convert to code")
+        _PARSER.add_argument("--file", type=str, help="File to analyze")
+    return _PARSER
+
+
+def parse_arguments(argv=None):
     """Parse command line arguments."""
-    parser = argparse.ArgumentParser(description="AI Programming Assistant")
-    parser.add_argument("--interactive", action="store_true", help="Start in interactive mode")
-    parser.add_argument("--gui", action="store_true", help="Start with graphical user interface")
-    parser.add_argument("--provider", type=str, default="claude", help="AI provider to use")
-    parser.add_argument("--model", type=str, help="Specific model to use")
-    parser.add_argument("--query", type=str, help="Single query to the assistant")
-    parser.add_argument("--task", type=str, help="Task description to convert to code")
-    parser.add_argument("--file", type=str, help="File to analyze")
-    return parser.parse_args()
+    return _get_parser().parse_args(argv)
 
 
 def main():
@@ -47,15 +115,12 @@ def main():
         model = args.model
     
     # Initialize the assistant with specified provider and model
-    assistant = ProgrammingAssistant(provider=args.provider, model=model)
-    
-    # Initialize the UI
-    ui = CommandLineInterface(assistant)
+    assistant = _get_assistant(args.provider, model)
     
     # Run in the appropriate mode
     if args.interactive:
         # Start interactive session
-        ui.start_interactive_session()
+        _start_interactive_session(assistant)
     elif args.task:
         # Convert task to code
         response = assistant.convert_task_to_code(args.task)
@@ -67,15 +132,18 @@ def main():
     elif args.file:
         # Analyze a file
         if os.path.exists(args.file):
-            with open(args.file, 'r') as f:
-                code = f.read()
-            response = assistant.analyze_code(code)
-            print(response)
+            try:
+                code = _read_source_file(args.file)
+            except UnicodeDecodeError as e:
+                print(f"Error: File {args.file} is not valid UTF-8 text ({e.reason} at byte {e.start}).")
+            else:
+                response = assistant.analyze_code(code)
+                print(response)
         else:
             print(f"Error: File {args.file} not found.")
     else:
         # By default, start interactive session
-        ui.start_interactive_session()
+        _start_interactive_session(assistant)
 
 
 if __name__ == "__main__":
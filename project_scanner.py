@@ -7,96 +7,251 @@ It excludes common system directories and files, and saves the output to a text
 """
 
 import os
+import stat
+import sys
 import argparse
 import datetime
-from pathlib import Path
+import math
+import time
+from functools import lru_cache
 
 # Directories and files to exclude from visualization
-EXCLUDE_DIRS = {
+EXCLUDE_DIRS = frozenset({
     '__pycache__', '.git', '.idea', '.vscode', '.pytest_cache',
     'venv', 'env', '.env', 'node_modules', 'build', 'dist', 'site-packages'
-}
+})
 
-EXCLUDE_FILES = {
+EXCLUDE_FILES = frozenset({
     '.DS_Store', 'Thumbs.db', '.gitignore', '*.pyc', '*.pyo', 
     '*.pyd', '*~', '.directory', '*.so', '*.exe'
-}
+})
 
+# Size units, one per power of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+# Many files share a size (empty files, small stubs), so cache the strings
+@lru_cache(maxsize=2048)
 def format_size(size_bytes):
     """Format file size in a human-readable format."""
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
-
-def format_timestamp(timestamp):
+    # Each unit covers 10 more bits of the size
+    unit = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
+
+# Formatted timestamps keyed by whole second; files that were checked out or
+# copied together often share a modification time
+_TIMESTAMP_CACHE = {}
+_TIMESTAMP_CACHE_SIZE = 4096
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# The keyword defaults bind the helpers as locals, sparing global lookups per call
+def format_timestamp(timestamp, _floor=math.floor, _strftime=time.strftime,
+                     _localtime=time.localtime, _cache=_TIMESTAMP_CACHE):
     """Format timestamp as a readable date and time."""
-    dt = datetime.datetime.fromtimestamp(timestamp)
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
-
-def should_exclude(path):
-    """Check if a path should be excluded from the visualization."""
-    path_obj = Path(path)
-    
-    # Check if any part of the path is in EXCLUDE_DIRS
-    for part in path_obj.parts:
-        if part in EXCLUDE_DIRS:
-            return True
-    
-    # Check for excluded files
-    for pattern in EXCLUDE_FILES:
-        if pattern.startswith('*') and path_obj.name.endswith(pattern[1:]):
-            return True
-        elif pattern == path_obj.name:
-            return True
-            
-    return False
+    second = _floor(timestamp)
+    formatted = _cache.get(second)
+    if formatted is None:
+        if len(_cache) >= _TIMESTAMP_CACHE_SIZE:
+            _cache.clear()
+        formatted = _strftime(_TIMESTAMP_FORMAT, _localtime(second))
+        _cache[second] = formatted
+    return formatted
 
-def dir_tree_generator(root_dir, prefix="", is_last=True, max_depth=None, current_depth=0):
-    """Generate the directory tree structure as strings."""
-    if max_depth is not None and current_depth > max_depth:
+# Exclusion patterns split once into exact names and "*" suffixes
+_EXCLUDE_NAMES = EXCLUDE_DIRS | {p for p in EXCLUDE_FILES if not p.startswith('*')}
+_EXCLUDE_SUFFIXES = tuple(p[1:] for p in EXCLUDE_FILES if p.startswith('*'))
+
+def should_exclude(name):
+    """
+    Check if a file or directory name should be excluded from the visualization.
+    
+    Only the entry's own name is checked: the walker never descends into an
+    excluded directory, so its contents are skipped without further checks.
+    """
+    return name in _EXCLUDE_NAMES or name.endswith(_EXCLUDE_SUFFIXES)
+
+class _RootEntry:
+    """Minimal os.DirEntry stand-in for the directory a scan starts from."""
+    
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self.name = os.path.basename(os.path.normpath(self.path))
+        self._stat = os.stat(self.path)
+    
+    def is_dir(self, follow_symlinks=True):
+        return stat.S_ISDIR(self._stat.st_mode)
+    
+    def is_file(self, follow_symlinks=True):
+        return stat.S_ISREG(self._stat.st_mode)
+    
+    def stat(self, follow_symlinks=True):
+        return self._stat
+
+def _branch(prefix, is_last):
+    """Return the branch marker for an item and the prefix for its children."""
+    if is_last:
+        return "└── ", prefix + "    "
+    return "├── ", prefix + "│   "
+
+def _iter_tree(root_entry, max_depth=None, prefix="", is_last=True, current_depth=0):
+    """Generate the tree lines for a directory entry and everything below it."""
+    # Children are filtered while their directory is listed, so the starting
+    # entry is the only one that still needs an exclusion check
+    if should_exclude(root_entry.name):
         return
+    
+    # Depth-first walk with an explicit stack of (entry, prefix, is_last, depth)
+    # frames; children are pushed in reverse so they pop in display order
+    stack = [(root_entry, prefix, is_last, current_depth)]
+    
+    while stack:
+        entry, prefix, is_last, depth = stack.pop()
         
-    # Skip excluded directories
-    if should_exclude(root_dir):
+        if max_depth is not None and depth > max_depth:
+            continue
+            
+        # Prepare the prefix for the current item
+        branch, new_prefix = _branch(prefix, is_last)
+        
+        # DirEntry answers these from the directory listing where it can,
+        # so regular entries need no extra stat call here
+        is_dir = entry.is_dir()
+        
+        # Get file information if it's a file; DirEntry caches the stat result,
+        # so size and modification time come from a single stat call
+        if not is_dir and entry.is_file():
+            st = entry.stat()
+            yield (f"{prefix}{branch}{entry.name} - {format_size(st.st_size)}, "
+                   f"Last modified: {format_timestamp(st.st_mtime)}")
+        else:
+            # For directories, just show the name
+            yield f"{prefix}{branch}{entry.name}/"
+        
+        # If it's a directory, queue its contents unless they are past max_depth
+        if is_dir and (max_depth is None or depth < max_depth):
+            # Get all items in the directory, dropping excluded names as the
+            # listing is consumed so excluded subtrees are never queued
+            with os.scandir(entry.path) as it:
+                items = [e for e in it
+                         if e.name not in _EXCLUDE_NAMES
+                         and not e.name.endswith(_EXCLUDE_SUFFIXES)]
+            items.sort(key=lambda e: (e.is_file(), e.name))
+            
+            last = len(items) - 1
+            for i in range(last, -1, -1):
+                stack.append((items[i], new_prefix, i == last, depth + 1))
+
+def _fwalk_children(dirpath, children, prefix, depth, child_info):
+    """
+    Generate (line, subdirectory) pairs for the listed children of a directory.
+    
+    subdirectory is set for directories whose own contents fwalk lists next,
+    and None for every other item.
+    """
+    last = len(children) - 1
+    for i, (name, st, descend) in enumerate(children):
+        branch, new_prefix = _branch(prefix, i == last)
+        if st is not None:
+            yield (f"{prefix}{branch}{name} - {format_size(st.st_size)}, "
+                   f"Last modified: {format_timestamp(st.st_mtime)}"), None
+        elif descend:
+            path = os.path.join(dirpath, name)
+            child_info[path] = (new_prefix, depth + 1)
+            yield f"{prefix}{branch}{name}/", path
+        else:
+            yield f"{prefix}{branch}{name}/", None
+
+def _drain(frames):
+    """Emit queued lines until reaching a directory fwalk lists next; return its path."""
+    while frames:
+        for line, subdir in frames[-1]:
+            yield line
+            if subdir is not None:
+                return subdir
+        frames.pop()
+    return None
+
+def _iter_tree_fwalk(root_dir, max_depth=None, prefix="", is_last=True, current_depth=0):
+    """
+    Generate the tree lines using os.fwalk.
+    
+    fwalk lists each directory through an open file descriptor, so entries are
+    stat'ed relative to it instead of resolving their full path every time.
+    Each directory's children are queued and listed in display order, pausing
+    at every subdirectory until fwalk has produced that subdirectory's contents.
+    """
+    root = _RootEntry(root_dir)
+    if should_exclude(root.name):
+        return
+    if not root.is_dir() or (max_depth is not None and current_depth >= max_depth):
+        yield from _iter_tree(root, max_depth, prefix, is_last, current_depth)
         return
+    
+    branch, child_prefix = _branch(prefix, is_last)
+    yield f"{prefix}{branch}{root.name}/"
+    
+    # Directories still to be listed, mapped to their children's prefix and depth
+    child_info = {root.path: (child_prefix, current_depth + 1)}
+    # Per open directory, the lines of its children that are not yet emitted
+    frames = []
+    awaiting = root.path
+    
+    for dirpath, dirnames, filenames, dirfd in os.fwalk(root.path, follow_symlinks=True):
+        # fwalk silently skips directories it cannot open; move past them
+        while awaiting is not None and awaiting != dirpath:
+            awaiting = yield from _drain(frames)
+        if awaiting is None:
+            break
         
-    # Prepare the prefix for the current item
-    if is_last:
-        branch = "└── "
-        new_prefix = prefix + "    "
-    else:
-        branch = "├── "
-        new_prefix = prefix + "│   "
+        prefix, depth = child_info.pop(dirpath)
+        descend = max_depth is None or depth < max_depth
         
-    # Get path information
-    path = Path(root_dir)
-    
-    # Get file information if it's a file
-    if path.is_file():
-        stats = path.stat()
-        size = format_size(stats.st_size)
-        modified = format_timestamp(stats.st_mtime)
-        yield f"{prefix}{branch}{path.name} - {size}, Last modified: {modified}"
-    else:
-        # For directories, just show the name
-        yield f"{prefix}{branch}{path.name}/"
-    
-    # If it's a directory, recursively process its contents
-    if path.is_dir():
-        # Get all items in the directory
-        items = sorted([p for p in path.iterdir() 
-                       if not should_exclude(p)], 
-                       key=lambda p: (p.is_file(), p.name))
+        subdirs = sorted(name for name in dirnames
+                         if name not in _EXCLUDE_NAMES
+                         and not name.endswith(_EXCLUDE_SUFFIXES))
+        children = [(name, None, descend) for name in subdirs]
+        for name in filenames:
+            if name in _EXCLUDE_NAMES or name.endswith(_EXCLUDE_SUFFIXES):
+                continue
+            try:
+                st = os.stat(name, dir_fd=dirfd)
+            except OSError:
+                st = None
+            if st is not None and stat.S_ISREG(st.st_mode):
+                children.append((name, st, False))
+            else:
+                # Anything that is not a regular file is shown like a directory
+                children.append((name, None, False))
+        children.sort(key=lambda c: (c[1] is not None, c[0]))
         
-        # Process each item
-        for i, item in enumerate(items):
-            is_last_item = (i == len(items) - 1)
-            yield from dir_tree_generator(item, new_prefix, is_last_item, max_depth, current_depth + 1)
+        # Prune in place so fwalk only enters the directories we list, in order
+        dirnames[:] = subdirs if descend else []
+        
+        frames.append(_fwalk_children(dirpath, children, prefix, depth, child_info))
+        awaiting = yield from _drain(frames)
+    
+    while frames:
+        yield from _drain(frames)
+
+# os.fwalk and dir_fd support are only available on POSIX platforms
+_HAVE_FWALK = hasattr(os, 'fwalk') and os.stat in os.supports_dir_fd
+
+def dir_tree_generator(root_dir, prefix="", is_last=True, max_depth=None, current_depth=0):
+    """Generate the directory tree structure as strings."""
+    if _HAVE_FWALK:
+        return _iter_tree_fwalk(root_dir, max_depth, prefix, is_last, current_depth)
+    return _iter_tree(_RootEntry(root_dir), max_depth, prefix, is_last, current_depth)
+
+class Tee:
+    """Minimal writer that forwards everything written to several streams."""
+    
+    def __init__(self, *streams):
+        self.streams = streams
+    
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
 
 def main():
     """Main function to scan and visualize project structure."""
@@ -114,27 +269,32 @@ def main():
     project_dir = os.path.abspath(args.path)
     project_name = os.path.basename(project_dir)
     
-    # Generate the project structure
-    lines = []
+    # A console stdout is line-buffered, which would flush after every tree
+    # line; buffer it fully while scanning and restore it afterwards
+    line_buffered = getattr(sys.stdout, 'line_buffering', False)
+    if line_buffered:
+        sys.stdout.reconfigure(line_buffering=False)
     
-    lines.append(f"Project Structure: {project_name}")
-    lines.append("=" * (len(project_name) + 18))
-    lines.append(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    lines.append(f"Root directory: {project_dir}")
-    lines.append("")
-    
-    # Add each line from the generator
-    for line in dir_tree_generator(project_dir, max_depth=args.depth):
-        lines.append(line)
-    
-    # Print to console
-    for line in lines:
-        print(line)
-    
-    # Save to file
-    with open(args.output, 'w', encoding='utf-8') as f:
-        for line in lines:
-            f.write(line + "\n")
+    # Stream the project structure to the console and the output file as it
+    # is generated, rather than collecting every line first
+    try:
+        with open(args.output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            tee = Tee(sys.stdout, f)
+            
+            tee.write(f"Project Structure: {project_name}\n")
+            tee.write("=" * (len(project_name) + 18) + "\n")
+            tee.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            tee.write(f"Root directory: {project_dir}\n")
+            tee.write("\n")
+            
+            # Add each line from the generator
+            for line in dir_tree_generator(project_dir, max_depth=args.depth):
+                tee.write(line)
+                tee.write("\n")
+    finally:
+        if line_buffered:
+            sys.stdout.flush()
+            sys.stdout.reconfigure(line_buffering=True)
     
     print(f"\nProject structure saved to {args.output}")
     
@@ -6,25 +6,32 @@ import os
 import sys
 from pathlib import Path
 
-# Add the project root to the Python path
-project_root = Path(__file__).resolve().parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
 
-# Import directly from the gui_app module
-from ui.gui_app import ProgrammingAssistantGUI
+def main():
+    """Set up the Python path, then import and run the GUI."""
+    # Add the project root to the Python path; __file__ is already absolute
+    # when the script is run directly, so no resolve() is needed
+    project_root = Path(__file__).parent
+    if str(project_root) not in sys.path:
+        sys.path.insert(0, str(project_root))
+
+    # Import the GUI only now, so importing this module stays cheap
+    from ui.gui_app import ProgrammingAssistantGUI
+
+    app = ProgrammingAssistantGUI()
+    app.run()
+
 
 # Run the application
 if __name__ == "__main__":
     try:
-        app = ProgrammingAssistantGUI()
-        app.run()
+        main()
     except Exception as e:
         print(f"Error starting application: {str(e)}")
-        
+
         # Print more detailed error info if available
         import traceback
         traceback.print_exc()
-        
+
         # Keep the console window open on error
-        input("Press Enter to exit...")
\ No newline at end of file
+        input("Press Enter to exit...")
@@ -1,12 +1,15 @@
 """
 Workaround API Client for interacting with the Claude API.
 """
+import logging
 import os
-from typing import Dict, Any, Optional, List
-import requests
-import json
-from dotenv import load_dotenv
-from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator
+
+from .api_clients.base_client import (
+    DEFAULT_SYSTEM_PROMPT, ProviderError, _load_env_file, _shared_session, encode_json, iter_sse_events
+)
+
+logger = logging.getLogger(__name__)
 
 class ClaudeAPIClient:
     """
@@ -22,14 +25,6 @@ class ClaudeAPIClient:
             api_key (str, optional): Claude API key. If not provided, it will be read from
                                 the environment variable or .env file.
         """
-        # Try to load from .env file explicitly
-        # Get the project root directory
-        project_root = Path(__file__).resolve().parent.parent
-        env_path = project_root / '.env'
-        
-        # Load the .env file
-        load_dotenv(dotenv_path=env_path)
-        
         # Try different ways to get the API key
         if api_key:
             self.api_key = api_key
@@ -38,6 +33,13 @@ class ClaudeAPIClient:
             self.api_key = (os.getenv('CLAUDE_API_KEY') or 
                           os.getenv('ANTHROPIC_API_KEY'))
         
+        # Only read the .env file if the environment is missing something we need
+        if not self.api_key or 'CLAUDE_MODEL' not in os.environ:
+            _load_env_file()
+            if not self.api_key:
+                self.api_key = (os.getenv('CLAUDE_API_KEY') or 
+                              os.getenv('ANTHROPIC_API_KEY'))
+        
         # Verify that we have an API key
         if not self.api_key:
             raise ValueError(
@@ -50,6 +52,13 @@ class ClaudeAPIClient:
         
         # API endpoint
         self.api_endpoint = "https://api.anthropic.com/v1/messages"
+        
+        # Request headers are the same for every call, so build them once
+        self._headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
     
     def set_model(self, model_name: str) -> None:
         """
@@ -76,56 +85,39 @@ class ClaudeAPIClient:
             The text response from Claude.
         """
         try:
-            # Default system prompt for programming assistance if none provided
-            default_system_prompt = """
-            You are an AI programming assistant. Your goal is to help with programming tasks
-            by providing clear, correct, and well-explained code and technical information.
-            When writing code, include helpful comments. For beginners, explain concepts
-            thoroughly and avoid jargon. Focus on Python programming best practices.
-            """
-            
-            # Use provided system prompt or default
-            system_instruction = system_prompt or default_system_prompt
-            
-            # Prepare the API request
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01"
-            }
-            
-            data = {
-                "model": self.model,
-                "system": system_instruction,
-                "max_tokens": max_tokens,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ]
-            }
-            
-            # Make the API call
-            response = requests.post(
-                self.api_endpoint,
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
-            
-            # Extract and return the response text
-            return result["content"][0]["text"]
+            return "".join(self.generate_response_stream(prompt, system_prompt, max_tokens))
         
         except Exception as e:
             # Handle API errors
             error_msg = f"Error when calling Claude API: {str(e)}"
-            print(error_msg)
+            logger.error(error_msg)
             if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
+                logger.debug("API response: %s", e.response.text)
             return f"I encountered an error: {error_msg}. Please check your API key and network connection."
     
+    def generate_response_stream(self, 
+                                 prompt: str, 
+                                 system_prompt: Optional[str] = None, 
+                                 max_tokens: int = 4000) -> Iterator[str]:
+        """
+        Generate a response from Claude, yielding the text as it is produced.
+        
+        Unlike generate_response, API errors are raised to the caller.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide Claude's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from Claude.
+        """
+        yield from self._stream_messages(
+            [{"role": "user", "content": prompt}],
+            system_prompt,
+            max_tokens
+        )
+    
     def generate_response_with_history(self, 
                                       messages: List[Dict[str, str]], 
                                       system_prompt: Optional[str] = None,
@@ -142,50 +134,74 @@ class ClaudeAPIClient:
             The text response from Claude.
         """
         try:
-            # Default system prompt for programming assistance if none provided
-            default_system_prompt = """
-            You are an AI programming assistant. Your goal is to help with programming tasks
-            by providing clear, correct, and well-explained code and technical information.
-            When writing code, include helpful comments. For beginners, explain concepts
-            thoroughly and avoid jargon. Focus on Python programming best practices.
-            """
-            
-            # Use provided system prompt or default
-            system_instruction = system_prompt or default_system_prompt
-            
-            # Prepare the API request
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01"
-            }
+            return "".join(self._stream_messages(messages, system_prompt, max_tokens))
+        
+        except Exception as e:
+            # Handle API errors
+            error_msg = f"Error when calling Claude API: {str(e)}"
+            logger.error(error_msg)
+            if hasattr(e, 'response') and hasattr(e.response, 'text'):
+                logger.debug("API response: %s", e.response.text)
+            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
+    
+    def _stream_messages(self, 
+                         messages: List[Dict[str, str]], 
+                         system_prompt: Optional[str],
+                         max_tokens: int) -> Iterator[str]:
+        """
+        Send a streaming request to the Messages API and yield the text deltas.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide Claude's behavior.
+            max_tokens: Maximum number of tokens in the response.
             
-            data = {
-                "model": self.model,
-                "system": system_instruction,
-                "max_tokens": max_tokens,
-                "messages": messages
-            }
+        Yields:
+            Successive pieces of the text response from Claude.
             
-            # Make the API call
-            response = requests.post(
+        Raises:
+            ProviderError: If the request fails or Claude reports an error.
+        """
+        # Already imported by the session
+        import requests
+        
+        # Use provided system prompt or default
+        system_instruction = system_prompt or DEFAULT_SYSTEM_PROMPT
+        
+        # Prepare the API request
+        data = {
+            "model": self.model,
+            "system": system_instruction,
+            "max_tokens": max_tokens,
+            "messages": messages,
+            "stream": True
+        }
+        
+        # Make the API call over the pooled session the provider clients use
+        try:
+            response = _shared_session().post(
                 self.api_endpoint,
-                headers=headers,
-                json=data
+                headers=self._headers,
+                data=encode_json(data),
+                stream=True
             )
-            
             response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
-            
-            # Extract and return the response text
-            return result["content"][0]["text"]
+        except requests.RequestException as e:
+            status_code = None
+            if e.response is not None:
+                status_code = e.response.status_code
+                # Reading the error body also hands the connection back to the pool
+                logger.debug("Claude API error body: %s", e.response.text)
+            raise ProviderError("Claude", str(e), status_code, e.response) from e
         
-        except Exception as e:
-            # Handle API errors
-            error_msg = f"Error when calling Claude API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
\ No newline at end of file
+        # Read the server-sent events as they arrive
+        with response:
+            for event in iter_sse_events(response):
+                event_type = event.get("type")
+                
+                if event_type == "content_block_delta":
+                    text = event["delta"].get("text")
+                    if text:
+                        yield text
+                elif event_type == "error":
+                    raise ProviderError("Claude", event["error"].get("message", "Unknown streaming error"))
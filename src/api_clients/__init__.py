@@ -1,39 +1,141 @@
 # src/api_clients/__init__.py
 
-from typing import Optional
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
-from .base_client import BaseAPIClient
-from .claude_client import ClaudeAPIClient
-from .openai_client import OpenAIAPIClient
-from .gemini_client import GeminiAPIClient
-from .huggingface_client import HuggingFaceAPIClient
-from .grok_client import GrokAPIClient
-from .deepseek_client import DeepseekAPIClient
+from ..response_cache import ResponseCache
+from ..semantic_cache import SemanticCache
+from .base_client import BaseAPIClient, ProviderError, close_session, error_response
 
-def create_api_client(provider: str, api_key: Optional[str] = None) -> BaseAPIClient:
+# Module and class of each client; a provider's module is only imported
+# once a client for it is created
+_CLIENT_CLASSES = {
+    'ClaudeAPIClient': 'claude_client',
+    'OpenAIAPIClient': 'openai_client',
+    'GeminiAPIClient': 'gemini_client',
+    'HuggingFaceAPIClient': 'huggingface_client',
+    'GrokAPIClient': 'grok_client',
+    'DeepseekAPIClient': 'deepseek_client',
+    'OpenAICompatibleClient': 'openai_compatible_client',
+    'ProviderSpec': 'openai_compatible_client',
+}
+
+# Client class name for each provider name, including aliases
+_CLIENTS = {
+    'claude': 'ClaudeAPIClient',
+    'anthropic': 'ClaudeAPIClient',
+    'openai': 'OpenAIAPIClient',
+    'gemini': 'GeminiAPIClient',
+    'google': 'GeminiAPIClient',
+    'huggingface': 'HuggingFaceAPIClient',
+    'grok': 'GrokAPIClient',
+    'deepseek': 'DeepseekAPIClient',
+}
+
+def __getattr__(name: str):
+    """
+    Import the client classes on first access, so that importing this package
+    does not load every provider's module.
+    """
+    module_name = _CLIENT_CLASSES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def create_api_client(provider: str, 
+                      api_key: Optional[str] = None, 
+                      cache: Optional[ResponseCache] = None) -> BaseAPIClient:
     """
     Factory function to create an API client for the specified provider.
     
     Args:
         provider: Name of the AI provider
         api_key: Optional API key for the provider
+        cache: Optional response cache for the client to use
         
     Returns:
         An instance of the appropriate API client
     """
     provider = provider.lower()
+    class_name = _CLIENTS.get(provider)
+    if class_name is None:
+        raise ValueError(f"Unsupported provider: {provider}")
+    return __getattr__(class_name)(api_key, cache)
+
+def multi_query(providers: List[str], 
+                prompt: str, 
+                system_prompt: Optional[str] = None, 
+                max_tokens: int = 4000, 
+                cache: Optional[ResponseCache] = None) -> Dict[str, str]:
+    """
+    Send the same prompt to several providers at once.
+    
+    Each provider's request runs in its own thread; the clients spend nearly
+    all their time waiting on the network, so the total wait is that of the
+    slowest provider rather than the sum of all of them.
+    
+    Args:
+        providers: Names of the AI providers to query
+        prompt: The user's message/query
+        system_prompt: Optional system prompt to guide the models' behavior
+        max_tokens: Maximum number of tokens in each response
+        cache: Optional response cache shared by all the clients
+        
+    Returns:
+        A dictionary mapping each provider name to its response text
+    """
+    # Create every client first so a missing API key fails before any request is sent
+    clients = {provider: create_api_client(provider, cache=cache) for provider in providers}
+    if not clients:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        futures = {
+            provider: executor.submit(client.generate_response, prompt, system_prompt, max_tokens)
+            for provider, client in clients.items()
+        }
+        responses = {}
+        for provider, future in futures.items():
+            # One provider failing should not discard the others' responses
+            try:
+                responses[provider] = future.result()
+            except Exception as e:
+                responses[provider] = error_response(provider, e)
+        return responses
+
+async def amulti_query(providers: List[str], 
+                       prompt: str, 
+                       system_prompt: Optional[str] = None, 
+                       max_tokens: int = 4000, 
+                       cache: Optional[ResponseCache] = None) -> Dict[str, str]:
+    """
+    Send the same prompt to several providers at once from async code.
+    
+    Like multi_query, the total wait is that of the slowest provider, but the
+    event loop stays free to run other tasks in the meantime.
+    
+    Args:
+        providers: Names of the AI providers to query
+        prompt: The user's message/query
+        system_prompt: Optional system prompt to guide the models' behavior
+        max_tokens: Maximum number of tokens in each response
+        cache: Optional response cache shared by all the clients
+        
+    Returns:
+        A dictionary mapping each provider name to its response text
+    """
+    import asyncio
     
-    if provider == 'claude' or provider == 'anthropic':
-        return ClaudeAPIClient(api_key)
-    elif provider == 'openai':
-        return OpenAIAPIClient(api_key)
-    elif provider == 'gemini' or provider == 'google':
-        return GeminiAPIClient(api_key)
-    elif provider == 'huggingface':
-        return HuggingFaceAPIClient(api_key)
-    elif provider == 'grok':
-        return GrokAPIClient(api_key)
-    elif provider == 'deepseek':
-        return DeepseekAPIClient(api_key)
-    else:
-        raise ValueError(f"Unsupported provider: {provider}")
\ No newline at end of file
+    # Create every client first so a missing API key fails before any request is sent
+    clients = {provider: create_api_client(provider, cache=cache) for provider in providers}
+    # One provider failing should not discard the others' responses
+    responses = await asyncio.gather(*(
+        client.agenerate_response(prompt, system_prompt, max_tokens) for client in clients.values()
+    ), return_exceptions=True)
+    return {
+        provider: error_response(provider, response) if isinstance(response, BaseException) else response
+        for provider, response in zip(clients, responses)
+    }
\ No newline at end of file
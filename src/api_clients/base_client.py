@@ -2,10 +2,441 @@
 Base API Client class for AI model providers.
 """
 import os
+import json
+import logging
+import functools
+import textwrap
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
-from pathlib import Path
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Iterator, AsyncIterator, Tuple
+
+if TYPE_CHECKING:
+    # requests is imported when the first session is created
+    import requests
+
+try:
+    import orjson
+except ImportError:
+    # orjson is an optional accelerator; the standard library works the same way
+    orjson = None
+
+from ..response_cache import ResponseCache, default_cache
+from ..rate_limiter import TokenBucket
+from ..circuit_breaker import CircuitBreaker
+from ..semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+# System prompt for programming assistance, used when a request provides none;
+# dedented once here rather than rebuilt on every call
+DEFAULT_SYSTEM_PROMPT = textwrap.dedent("""
+    You are an AI programming assistant. Your goal is to help with programming tasks
+    by providing clear, correct, and well-explained code and technical information.
+    When writing code, include helpful comments. For beginners, explain concepts
+    thoroughly and avoid jargon. Focus on Python programming best practices.
+""").strip()
+
+# Location of the project's .env file
+_ENV_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env'
+)
+
+# Set once the .env file has been read into the environment
+_ENV_LOADED = False
+
+def _load_env_file() -> None:
+    """Load the project's .env file into the environment, once per process."""
+    global _ENV_LOADED
+    if not _ENV_LOADED:
+        from dotenv import load_dotenv
+        
+        load_dotenv(dotenv_path=_ENV_PATH)
+        _ENV_LOADED = True
+
+# Connections kept open per host; also bounds how many requests a client runs at once
+_POOL_MAXSIZE = 20
+
+# Seconds a request waits for a free pooled connection before giving up
+_POOL_TIMEOUT = 60
+
+def _pool_maxsize() -> int:
+    """
+    Return the number of connections kept open per host.
+    
+    LLM_HTTP_POOL_MAXSIZE overrides the default for callers that send more
+    requests to one provider at a time.
+    """
+    return int(os.getenv('LLM_HTTP_POOL_MAXSIZE', _POOL_MAXSIZE))
+
+# Rough number of characters per token, used to estimate the size of a
+# conversation without running the provider's tokenizer
+_CHARS_PER_TOKEN = 4
+
+def _create_session() -> 'requests.Session':
+    """
+    Create an HTTP session that keeps connections to the provider alive.
+    
+    Returns:
+        A requests.Session with a pooled adapter that retries rate-limited
+        and transient server errors.
+    """
+    import socket
+    import ssl
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.util.retry import Retry
+    from urllib3.util.ssl_ import create_urllib3_context
+    
+    class ResumingSSLSocket(ssl.SSLSocket):
+        """
+        TLS socket that resumes the latest session with its host instead of
+        doing a full handshake.
+        """
+        
+        # Latest resumable session per host name
+        sessions = {}
+        
+        def do_handshake(self, block=False):
+            session = self.sessions.get(self.server_hostname)
+            if session is not None:
+                try:
+                    self.session = session
+                except ValueError:
+                    # The session was made with another adapter's context
+                    pass
+            super().do_handshake(block)
+            self._remember_session()
+        
+        def close(self):
+            # TLS 1.3 servers send their ticket after the handshake, so the
+            # session is saved again once the connection is finished with
+            self._remember_session()
+            super().close()
+        
+        def _remember_session(self):
+            session = self.session
+            if session is not None and session.has_ticket:
+                self.sessions[self.server_hostname] = session
+    
+    class BoundedWaitMixin:
+        """
+        Connection pool mixin that waits at most _POOL_TIMEOUT seconds for a free connection.
+        """
+        
+        def urlopen(self, *args, **kwargs):
+            # requests never passes a pool timeout, which would wait forever
+            kwargs.setdefault("pool_timeout", _POOL_TIMEOUT)
+            return super().urlopen(*args, **kwargs)
+    
+    class BoundedWaitHTTPConnectionPool(BoundedWaitMixin, HTTPConnectionPool):
+        pass
+    
+    class BoundedWaitHTTPSConnectionPool(BoundedWaitMixin, HTTPSConnectionPool):
+        pass
+    
+    class TunedHTTPAdapter(HTTPAdapter):
+        """
+        Adapter whose connections resume TLS sessions and keep TCP keep-alive enabled.
+        """
+        
+        def init_poolmanager(self, *args, **kwargs):
+            # urllib3 already sets TCP_NODELAY; keep-alive stops idle pooled
+            # connections from being dropped silently between requests
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+            # Session tickets, offered again on the next connection to the same
+            # host, let a reconnect resume TLS instead of doing a full handshake
+            context = create_urllib3_context()
+            context.options &= ~ssl.OP_NO_TICKET
+            context.sslsocket_class = ResumingSSLSocket
+            kwargs["ssl_context"] = context
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": BoundedWaitHTTPConnectionPool,
+                "https": BoundedWaitHTTPSConnectionPool,
+            }
+    
+    retry_options = dict(
+        total=5,
+        # Exponential backoff from 0.5s, capped so a retry never waits more than 16s
+        backoff_factor=0.5,
+        backoff_max=16,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"POST"}),
+        # Wait as long as a rate-limited provider asks before retrying
+        respect_retry_after_header=True
+    )
+    try:
+        # Jitter keeps concurrent clients that hit the same error from retrying in lockstep
+        retry = Retry(backoff_jitter=0.5, **retry_options)
+    except TypeError:
+        # urllib3 1.x has no backoff jitter and a fixed 120s backoff cap
+        del retry_options["backoff_max"]
+        retry = Retry(**retry_options)
+    # Blocking makes requests beyond the pool size wait for a pooled connection,
+    # instead of opening extra ones that are closed again straight after use;
+    # the wait is bounded, so connections held by abandoned streams cannot
+    # hang every later request
+    adapter = TunedHTTPAdapter(
+        pool_connections=10, pool_maxsize=_pool_maxsize(), pool_block=True, max_retries=retry
+    )
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Session shared by every client, created on first use
+_SESSION = None
+_SESSION_LOCK = Lock()
+
+def _shared_session() -> 'requests.Session':
+    """
+    Return the HTTP session shared by all API clients.
+    
+    Clients are created per provider and recreated whenever the model changes;
+    sharing one connection pool lets a new client reuse the connection an earlier
+    one already opened to the same provider instead of opening another.
+    
+    Returns:
+        The process-wide requests.Session.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _create_session()
+        return _SESSION
+
+def close_session() -> None:
+    """
+    Close the shared HTTP session and its pooled connections.
+    
+    Clients stay usable; the next request opens a new session.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+# Rate limiters keyed by (provider, API key), so every client using the same
+# key draws from the same budget
+_RATE_LIMITERS: Dict[tuple, TokenBucket] = {}
+_RATE_LIMITERS_LOCK = Lock()
+
+def _rate_limiter(provider: str, api_key: Optional[str], requests_per_minute: float, burst: float) -> TokenBucket:
+    """
+    Return the rate limiter for a provider and API key, creating it on first use.
+    
+    Args:
+        provider: Name of the AI provider.
+        api_key: API key the requests are sent with.
+        requests_per_minute: Sustained request rate allowed for the key.
+        burst: Number of requests that may be sent back to back.
+        
+    Returns:
+        The TokenBucket shared by all clients using the key.
+    """
+    key = (provider, api_key)
+    with _RATE_LIMITERS_LOCK:
+        bucket = _RATE_LIMITERS.get(key)
+        if bucket is None:
+            bucket = _RATE_LIMITERS[key] = TokenBucket(requests_per_minute / 60.0, burst)
+        return bucket
+
+# Circuit breakers keyed by (provider, API key), like the rate limiters
+_CIRCUIT_BREAKERS: Dict[tuple, CircuitBreaker] = {}
+_CIRCUIT_BREAKERS_LOCK = Lock()
+
+def _circuit_breaker(provider: str, api_key: Optional[str], fail_max: int, reset_timeout: float) -> CircuitBreaker:
+    """
+    Return the circuit breaker for a provider and API key, creating it on first use.
+    
+    Args:
+        provider: Name of the AI provider.
+        api_key: API key the requests are sent with.
+        fail_max: Consecutive failures after which requests are paused.
+        reset_timeout: Seconds requests stay paused before a trial request.
+        
+    Returns:
+        The CircuitBreaker shared by all clients using the key.
+    """
+    key = (provider, api_key)
+    with _CIRCUIT_BREAKERS_LOCK:
+        breaker = _CIRCUIT_BREAKERS.get(key)
+        if breaker is None:
+            breaker = _CIRCUIT_BREAKERS[key] = CircuitBreaker(fail_max, reset_timeout)
+        return breaker
+
+def encode_json(data: Any) -> bytes:
+    """
+    Serialize a request payload to JSON bytes.
+    
+    Args:
+        data: The payload to send.
+        
+    Returns:
+        The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def decode_json(content: bytes) -> Any:
+    """
+    Parse a JSON response body.
+    
+    Args:
+        content: The raw response body.
+        
+    Returns:
+        The decoded JSON value.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def iter_sse_events(response: 'requests.Response') -> Iterator[Any]:
+    """
+    Decode the JSON events of a server-sent events response.
+    
+    Args:
+        response: A streaming response from the provider.
+        
+    Yields:
+        The decoded payload of each event, until the stream ends or sends [DONE].
+    """
+    for line in response.iter_lines():
+        # Only the "data:" lines of an event carry a payload
+        if not line.startswith(b"data:"):
+            continue
+        
+        payload = line[5:].strip()
+        if payload == b"[DONE]":
+            return
+        yield decode_json(payload)
+
+class ProviderError(Exception):
+    """
+    A request to an AI provider failed or the provider reported an error.
+    
+    The generate methods describe it in the text they return; streaming
+    methods raise it to the caller.
+    """
+    
+    def __init__(self, 
+                 provider: str, 
+                 message: str, 
+                 status_code: Optional[int] = None, 
+                 response: Optional['requests.Response'] = None):
+        """
+        Initialize the error.
+        
+        Args:
+            provider: Name of the AI provider.
+            message: Description of the failure.
+            status_code: HTTP status of the provider's reply, if it sent one.
+            response: The provider's reply, if it sent one.
+        """
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        self.response = response
+
+def error_response(provider: str, error: BaseException) -> str:
+    """
+    Log a failed request and describe it in the text returned to the caller.
+    
+    Args:
+        provider: Name of the AI provider.
+        error: The exception the request raised.
+        
+    Returns:
+        The error message shown in place of the model's response.
+    """
+    error_msg = f"Error when calling {provider} API: {str(error)}"
+    logger.error(error_msg, extra={"provider": provider, "status_code": getattr(error, 'status_code', None)})
+    return f"I encountered an error: {error_msg}. Please check your API key and network connection."
+
+def _flight_key(client: 'BaseAPIClient', name: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """
+    Identify a generate call, so identical concurrent calls can share one request.
+    """
+    return encode_json([name, client.model, args, kwargs])
+
+def _join_flight(client: 'BaseAPIClient', key: Any) -> Tuple[Future, bool]:
+    """
+    Find the in-flight call for a request, or register a new one.
+    
+    Args:
+        client: The client making the request.
+        key: Key returned by _flight_key.
+        
+    Returns:
+        The future that receives the call's result, and whether the caller
+        registered it and so has to make the call.
+    """
+    with client._inflight_lock:
+        future = client._inflight.get(key)
+        if future is not None:
+            return future, False
+        future = client._inflight[key] = Future()
+        # A running future cannot be cancelled, so a waiter whose task is
+        # cancelled does not cancel the call for everyone else
+        future.set_running_or_notify_cancel()
+    return future, True
+
+def _lead_flight(client: 'BaseAPIClient', key: Any, future: Future, method, *args, **kwargs):
+    """
+    Make a registered call and hand its result to the callers waiting on it.
+    
+    Args:
+        client: The client making the request.
+        key: Key the call was registered under.
+        future: Future returned by _join_flight.
+        method: The undecorated generate method to call.
+        
+    Returns:
+        The method's result.
+    """
+    try:
+        result = method(client, *args, **kwargs)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with client._inflight_lock:
+            del client._inflight[key]
+
+def single_flight(method):
+    """
+    Decorator that shares one provider call between identical concurrent requests.
+    
+    While a request is in flight, another caller making the same request on the
+    same client waits for its result instead of sending the request again.
+    
+    Args:
+        method: A generate method of a BaseAPIClient subclass.
+        
+    Returns:
+        The wrapped method.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = _flight_key(self, method.__name__, args, kwargs)
+        future, leader = _join_flight(self, key)
+        if not leader:
+            return future.result()
+        return _lead_flight(self, key, future, method, *args, **kwargs)
+    
+    return wrapper
 
 class BaseAPIClient(ABC):
     """
@@ -13,15 +444,284 @@ class BaseAPIClient(ABC):
     Defines common interface for all model providers.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Attributes shared by every client; subclasses list only what they add.
+    # Clients are recreated on every provider or model switch, so they skip
+    # the per-instance __dict__
+    __slots__ = (
+        "api_key", "cache", "semantic_cache", "model", "max_history_tokens", "api_endpoint",
+        "_base_headers", "_inflight", "_inflight_lock", "_owns_cache"
+    )
+    
+    # Name of the provider in error messages
+    provider_name = "AI"
+    
+    # Client-side request rate limit per API key; providers with higher
+    # limits can raise these
+    requests_per_minute = 50
+    request_burst = 10
+    
+    # Failed requests in a row, after retries, that pause requests to the
+    # provider, and how many seconds the pause lasts
+    breaker_fail_max = 5
+    breaker_reset_timeout = 30
+    
+    # Largest max_tokens each model accepts, for models with a known limit;
+    # other models are checked against MAX_TOKENS_LIMIT
+    MODEL_LIMITS: Dict[str, int] = {}
+    MAX_TOKENS_LIMIT = 200_000
+    
+    # Longest prompt or message, in characters, sent to a provider
+    MAX_PROMPT_CHARS = 1_000_000
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """
         Initialize the API client.
         
         Args:
             api_key: API key for the model provider. If not provided, will try to get it from environment.
+            cache: Optional response cache; repeated requests are answered from it
+                   instead of calling the provider again. Defaults to the cache
+                   selected by the LLM_CACHE_BACKEND environment variable.
         """
         self.api_key = api_key
+        
+        # Subclasses read their keys and models from the environment, which
+        # the .env file only needs to populate once
+        _load_env_file()
+        self.cache = cache if cache is not None else default_cache()
+        # The default cache is shared by every client, so only a cache given
+        # to this client is closed with it
+        self._owns_cache = cache is not None
+        
+        # Opt-in cache that also answers reworded prompts; set it only where a
+        # close match may stand in for an exact one
+        self.semantic_cache: Optional[SemanticCache] = None
         self.model = ""  # Default model will be set by subclasses
+        
+        # Token budget for the conversation history sent with each request;
+        # None sends the whole history
+        self.max_history_tokens: Optional[int] = None
+        
+        # Requests currently being sent, for single_flight
+        self._inflight = {}
+        self._inflight_lock = Lock()
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """
+        HTTP session used for requests to the provider.
+        
+        The session, and requests itself, are only loaded once the first request
+        is sent; it is shared so repeated calls skip the TCP and TLS setup.
+        """
+        return _shared_session()
+    
+    def close(self) -> None:
+        """
+        Close the response cache the client was given.
+        
+        The connection pool and the default cache are shared by every client,
+        including ones with streams still in progress, so they are left open;
+        close the pool with the module-level close_session() once no client
+        needs it.
+        """
+        if self._owns_cache:
+            self.cache.close()
+    
+    def __enter__(self) -> 'BaseAPIClient':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def _post(self, url: str, **kwargs) -> 'requests.Response':
+        """
+        Send a POST request on the shared session once the rate limiter allows it.
+        
+        While the provider keeps failing, requests are refused without being
+        sent until the circuit breaker lets a trial request through.
+        
+        Args:
+            url: The endpoint to post to.
+            **kwargs: Further arguments for requests.Session.post.
+            
+        Returns:
+            The provider's response.
+            
+        Raises:
+            ProviderError: If the request fails, the provider returns an HTTP error
+                           or requests to the provider are paused.
+        """
+        # Already imported by the session
+        import requests
+        from urllib3.exceptions import EmptyPoolError
+        
+        provider = type(self).__name__
+        breaker = _circuit_breaker(provider, self.api_key, self.breaker_fail_max, self.breaker_reset_timeout)
+        paused_for = breaker.allow()
+        if paused_for:
+            raise ProviderError(
+                self.provider_name,
+                f"requests paused for {paused_for:.0f}s after repeated failures"
+            )
+        
+        _rate_limiter(provider, self.api_key, self.requests_per_minute, self.request_burst).acquire()
+        try:
+            response = self.session.post(url, **kwargs)
+            response.raise_for_status()
+        except EmptyPoolError as e:
+            # Too many requests in progress on this client's side; the provider is not at fault
+            raise ProviderError(
+                self.provider_name, f"no free connection after waiting {_POOL_TIMEOUT}s"
+            ) from e
+        except requests.RequestException as e:
+            status_code = None
+            if e.response is not None:
+                status_code = e.response.status_code
+                # Reading the error body also hands a streamed connection back to the pool
+                logger.debug("%s API error body: %s", self.provider_name, e.response.text)
+            # Only outages and rate limiting count against the provider; other
+            # client errors mean the provider itself is answering
+            if status_code is None or status_code == 429 or status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise ProviderError(self.provider_name, str(e), status_code, e.response) from e
+        breaker.record_success()
+        return response
+    
+    def _post_json(self, url: str, body: bytes) -> Any:
+        """
+        Post an encoded JSON request with the client's headers and decode the reply.
+        
+        Args:
+            url: The endpoint to post to.
+            body: The request payload, already encoded with encode_json.
+            
+        Returns:
+            The decoded JSON response.
+        """
+        response = self._post(url, headers=self._base_headers, data=body)
+        return decode_json(response.content)
+    
+    def _cache_key(self, prompt: Any, system_prompt: Optional[str], max_tokens: int) -> Optional[str]:
+        """
+        Build the response cache key for a request.
+        
+        Args:
+            prompt: The user's message, or the list of messages for a conversation.
+            system_prompt: Optional system prompt sent with the request.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Returns:
+            The cache key, or None if this client has no cache.
+        """
+        if self.cache is None:
+            return None
+        return ResponseCache.make_key(type(self).__name__, self.model, system_prompt, prompt, max_tokens)
+    
+    def _cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """
+        Return the cached response for a cache key, or None on a miss.
+        """
+        if cache_key is None:
+            return None
+        return self.cache.get(cache_key)
+    
+    def _store_response(self, cache_key: Optional[str], response: str) -> str:
+        """
+        Cache a response from the provider and return it unchanged.
+        """
+        if cache_key is not None:
+            self.cache.put(cache_key, response)
+        return response
+    
+    def _error_response(self, error: BaseException) -> str:
+        """
+        Log a failed request to this client's provider and describe it for the caller.
+        """
+        return error_response(self.provider_name, error)
+    
+    def _validate_request(self, 
+                          max_tokens: int, 
+                          prompt: Optional[str] = None, 
+                          messages: Optional[List[Dict[str, str]]] = None) -> None:
+        """
+        Reject a request the provider would refuse, before any network round trip.
+        
+        Args:
+            max_tokens: Maximum number of tokens in the response.
+            prompt: The user's prompt, for single-prompt requests.
+            messages: The conversation, for requests with history.
+            
+        Raises:
+            ValueError: If a parameter is out of range or the messages are malformed.
+        """
+        limit = self.MODEL_LIMITS.get(self.model, self.MAX_TOKENS_LIMIT)
+        if not isinstance(max_tokens, int) or isinstance(max_tokens, bool) or not 0 < max_tokens <= limit:
+            raise ValueError(f"max_tokens must be an integer from 1 to {limit} for {self.model}, got {max_tokens!r}")
+        
+        if prompt is not None and len(prompt) > self.MAX_PROMPT_CHARS:
+            raise ValueError(f"Prompt is {len(prompt)} characters long; the limit is {self.MAX_PROMPT_CHARS}")
+        
+        if messages is not None:
+            if not messages:
+                raise ValueError("Conversation history must contain at least one message")
+            for msg in messages:
+                if "role" not in msg or "content" not in msg:
+                    raise ValueError("Each message needs 'role' and 'content' keys")
+                if len(msg["content"]) > self.MAX_PROMPT_CHARS:
+                    raise ValueError(
+                        f"Message is {len(msg['content'])} characters long; the limit is {self.MAX_PROMPT_CHARS}"
+                    )
+    
+    def _similar_response(self, prompt: str, system_prompt: Optional[str], max_tokens: int) -> Optional[str]:
+        """
+        Return the response to a cached prompt similar to this one, or None on a miss.
+        """
+        if self.semantic_cache is None:
+            return None
+        scope = ResponseCache.make_key(type(self).__name__, self.model, system_prompt, "", max_tokens)
+        return self.semantic_cache.search(scope, prompt)
+    
+    def _store_similar(self, prompt: str, system_prompt: Optional[str], max_tokens: int, response: str) -> None:
+        """
+        Add a response to the similarity cache, if this client has one.
+        """
+        if self.semantic_cache is not None:
+            scope = ResponseCache.make_key(type(self).__name__, self.model, system_prompt, "", max_tokens)
+            self.semantic_cache.add(scope, prompt, response)
+    
+    def _trim_history(self, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Drop the oldest messages that do not fit in max_history_tokens.
+        
+        Token counts are estimated from the length of each message. The newest
+        message is always kept, and the trimmed history starts with a user message.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            
+        Returns:
+            The most recent messages that fit in the budget.
+        """
+        budget = self.max_history_tokens
+        if budget is None or not messages:
+            return messages
+        
+        # Walk back from the newest message until the budget runs out
+        start = len(messages) - 1
+        used = len(messages[start]["content"]) // _CHARS_PER_TOKEN + 1
+        while start > 0:
+            used += len(messages[start - 1]["content"]) // _CHARS_PER_TOKEN + 1
+            if used > budget:
+                break
+            start -= 1
+        
+        # Providers expect a conversation to open with the user's turn
+        while start < len(messages) - 1 and messages[start]["role"] != "user":
+            start += 1
+        return messages[start:] if start else messages
     
     @abstractmethod
     def set_model(self, model_name: str) -> None:
@@ -67,4 +767,255 @@ class BaseAPIClient(ABC):
         Returns:
             The text response from the model.
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def generate_response_stream(self, 
+                                 prompt: str, 
+                                 system_prompt: Optional[str] = None, 
+                                 max_tokens: int = 4000) -> Iterator[str]:
+        """
+        Generate a response, yielding the text as it is produced.
+        
+        Clients without a streaming API yield the complete response as a single
+        piece. For the others, unlike generate_response, API errors are raised
+        to the caller.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        self._validate_request(max_tokens, prompt=prompt)
+        
+        # Answer a repeated request from the cache without calling the API
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is None:
+            cached = self._similar_response(prompt, system_prompt, max_tokens)
+        if cached is not None:
+            yield cached
+            return
+        
+        chunks = []
+        stream = self._stream_prompt(prompt, system_prompt, max_tokens)
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Hand the connection back to the pool even if the caller stops reading early
+            stream.close()
+        
+        # Only a response that streamed to the end is cached
+        text = "".join(chunks)
+        self._store_similar(prompt, system_prompt, max_tokens, text)
+        self._store_response(cache_key, text)
+    
+    async def agenerate_response(self, 
+                                 prompt: str, 
+                                 system_prompt: Optional[str] = None, 
+                                 max_tokens: int = 4000) -> str:
+        """
+        Generate a response without blocking the event loop.
+        
+        The request runs on a worker thread over the shared session, so calls
+        to several clients can be awaited together with asyncio.gather.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Returns:
+            The text response from the model.
+        """
+        return await self._shared_call("generate_response", prompt, system_prompt, max_tokens)
+    
+    async def agenerate_response_with_history(self, 
+                                              messages: List[Dict[str, str]], 
+                                              system_prompt: Optional[str] = None,
+                                              max_tokens: int = 4000) -> str:
+        """
+        Generate a response based on conversation history without blocking the event loop.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Returns:
+            The text response from the model.
+        """
+        return await self._shared_call(
+            "generate_response_with_history", messages, system_prompt, max_tokens
+        )
+    
+    async def _shared_call(self, name: str, *args) -> str:
+        """
+        Run a generate method on a worker thread, sharing identical concurrent calls.
+        
+        Callers that find the same request already in flight await its result
+        on the event loop rather than each holding a worker thread while they wait.
+        
+        Args:
+            name: Name of the generate method.
+            *args: Positional arguments for the method.
+            
+        Returns:
+            The text response from the model.
+        """
+        # asyncio is only imported by callers that use the async interface
+        import asyncio
+        
+        method = getattr(type(self), name)
+        undecorated = getattr(method, '__wrapped__', None)
+        if undecorated is None:
+            # The subclass does not use single_flight for this method
+            return await asyncio.to_thread(method, self, *args)
+        
+        key = _flight_key(self, undecorated.__name__, args, {})
+        future, leader = _join_flight(self, key)
+        if leader:
+            return await asyncio.to_thread(_lead_flight, self, key, future, undecorated, *args)
+        return await asyncio.wrap_future(future)
+    
+    async def agenerate_response_stream(self, 
+                                        prompt: str, 
+                                        system_prompt: Optional[str] = None, 
+                                        max_tokens: int = 4000) -> AsyncIterator[str]:
+        """
+        Generate a response, yielding the text as it is produced, without blocking the event loop.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        import asyncio
+        
+        # Each read from the stream waits on the network, so it runs on a worker thread
+        chunks = self.generate_response_stream(prompt, system_prompt, max_tokens)
+        done = object()
+        # A read can still be running on its thread when the consumer is
+        # cancelled, and the stream cannot be closed until it finishes
+        lock = Lock()
+        
+        def read():
+            with lock:
+                return next(chunks, done)
+        
+        def close():
+            with lock:
+                chunks.close()
+        
+        try:
+            while True:
+                chunk = await asyncio.to_thread(read)
+                if chunk is done:
+                    return
+                yield chunk
+        finally:
+            # Hand the connection back to the pool even if the consumer stops early
+            await asyncio.to_thread(close)
+    
+    def _stream_prompt(self, 
+                       prompt: str, 
+                       system_prompt: Optional[str],
+                       max_tokens: int) -> Iterator[str]:
+        """
+        Yield the text of a response to a single prompt as it arrives.
+        
+        The prompt is sent as a one-message conversation; clients that format
+        a single prompt differently in generate_response override this, so a
+        streamed response is cached under the request it actually answers.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        yield from self._stream_messages([{"role": "user", "content": prompt}], system_prompt, max_tokens)
+    
+    def _stream_messages(self, 
+                         messages: List[Dict[str, str]], 
+                         system_prompt: Optional[str],
+                         max_tokens: int) -> Iterator[str]:
+        """
+        Yield the text of a response to a conversation as it arrives.
+        
+        Clients whose API supports streaming override this; by default the
+        complete response is requested and yielded in one piece.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        yield self.generate_response_with_history(messages, system_prompt, max_tokens)
+    
+    def generate_responses(self, 
+                           prompts: List[str], 
+                           system_prompt: Optional[str] = None, 
+                           max_tokens: int = 4000) -> List[str]:
+        """
+        Generate responses for several independent prompts.
+        
+        The requests are sent concurrently over the client's pooled session, so
+        the prompts share its open connections and wait on the network together
+        instead of one after another.
+        
+        Args:
+            prompts: The user's messages/queries.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in each response.
+            
+        Returns:
+            The text responses from the model, in the same order as the prompts.
+        """
+        if not prompts:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(len(prompts), _pool_maxsize())) as executor:
+            return list(executor.map(
+                lambda prompt: self.generate_response(prompt, system_prompt, max_tokens),
+                prompts
+            ))
+    
+    def generate_responses_with_history(self, 
+                                        conversations: List[List[Dict[str, str]]], 
+                                        system_prompt: Optional[str] = None, 
+                                        max_tokens: int = 4000) -> List[str]:
+        """
+        Generate the next response for several independent conversations.
+        
+        Like generate_responses, the requests are sent concurrently over the
+        client's pooled session.
+        
+        Args:
+            conversations: Lists of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide model's behavior.
+            max_tokens: Maximum number of tokens in each response.
+            
+        Returns:
+            The text responses from the model, in the same order as the conversations.
+        """
+        if not conversations:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(len(conversations), _pool_maxsize())) as executor:
+            return list(executor.map(
+                lambda messages: self.generate_response_with_history(messages, system_prompt, max_tokens),
+                conversations
+            ))
\ No newline at end of file
@@ -2,35 +2,58 @@
 Client for interacting with the Claude API.
 """
 import os
-import requests
-from typing import Dict, Any, Optional, List
-from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, List, Iterator
 
-from .base_client import BaseAPIClient
+from .base_client import BaseAPIClient, ProviderError, single_flight, DEFAULT_SYSTEM_PROMPT, encode_json, iter_sse_events
+from ..response_cache import ResponseCache
+
+# Marks a content block as the end of a prefix Anthropic may cache between requests
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+def _with_cache_control(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of a message whose last content block is marked as cacheable.
+    
+    Args:
+        message: Message object whose content is a string or a list of content blocks.
+        
+    Returns:
+        The marked message; the caller's message and blocks are left unchanged.
+    """
+    content = message["content"]
+    if isinstance(content, str):
+        content = [{"type": "text", "text": content, "cache_control": _CACHE_CONTROL}]
+    elif content:
+        # Image and tool blocks stay as they are; only the last one carries the marker
+        content = content[:-1] + [{**content[-1], "cache_control": _CACHE_CONTROL}]
+    return {**message, "content": content}
 
 class ClaudeAPIClient(BaseAPIClient):
     """
     Client for interacting with the Claude API using direct HTTP requests.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    __slots__ = ()
+    
+    provider_name = "Claude"
+    
+    MODEL_LIMITS = {
+        "claude-3-opus-20240229": 4096,
+        "claude-3-sonnet-20240229": 4096,
+        "claude-3-haiku-20240307": 4096,
+        "claude-2.1": 4096,
+    }
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """
         Initialize the Claude API client.
         
         Args:
             api_key: Claude API key. If not provided, it will be read from
                     the environment variable or .env file.
+            cache: Optional response cache shared with other clients.
         """
-        super().__init__(api_key)
-        
-        # Try to load from .env file explicitly
-        # Get the project root directory
-        project_root = Path(__file__).resolve().parent.parent.parent
-        env_path = project_root / '.env'
-        
-        # Load the .env file
-        load_dotenv(dotenv_path=env_path)
+        super().__init__(api_key, cache)
         
         # Try different ways to get the API key
         if not self.api_key:
@@ -50,6 +73,13 @@ class ClaudeAPIClient(BaseAPIClient):
         
         # API endpoint
         self.api_endpoint = "https://api.anthropic.com/v1/messages"
+        
+        # Request headers are the same for every call, so build them once
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
     
     def set_model(self, model_name: str) -> None:
         """
@@ -60,6 +90,7 @@ class ClaudeAPIClient(BaseAPIClient):
         """
         self.model = model_name
     
+    @single_flight
     def generate_response(self, 
                           prompt: str, 
                           system_prompt: Optional[str] = None, 
@@ -75,61 +106,39 @@ class ClaudeAPIClient(BaseAPIClient):
         Returns:
             The text response from Claude.
         """
+        # Report a request the provider would reject like any other API error
         try:
-            # Default system prompt for programming assistance if none provided
-            default_system_prompt = """
-            You are an AI programming assistant. Your goal is to help with programming tasks
-            by providing clear, correct, and well-explained code and technical information.
-            When writing code, include helpful comments. For beginners, explain concepts
-            thoroughly and avoid jargon. Focus on Python programming best practices.
-            """
-            
-            # Use provided system prompt or default
-            system_instruction = system_prompt or default_system_prompt
-            
-            # Prepare the API request
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01"
-            }
-            
-            data = {
-                "model": self.model,
-                "system": system_instruction,
-                "max_tokens": max_tokens,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ]
-            }
-            
-            # Make the API call
-            response = requests.post(
-                self.api_endpoint,
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
-            
-            # Extract and return the response text
-            return result["content"][0]["text"]
+            self._validate_request(max_tokens, prompt=prompt)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Answer a repeated or reworded request from the caches without calling the API
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is None:
+            cached = self._similar_response(prompt, system_prompt, max_tokens)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Collect the streamed text into the complete response
+            text = "".join(self._stream_messages(
+                [{"role": "user", "content": prompt}],
+                system_prompt,
+                max_tokens
+            ))
+            self._store_similar(prompt, system_prompt, max_tokens, text)
+            return self._store_response(cache_key, text)
         
         except Exception as e:
             # Handle API errors
-            error_msg = f"Error when calling Claude API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
+            return self._error_response(e)
     
+    @single_flight
     def generate_response_with_history(self, 
-                                      messages: List[Dict[str, str]], 
-                                      system_prompt: Optional[str] = None,
-                                      max_tokens: int = 4000) -> str:
+                                       messages: List[Dict[str, str]], 
+                                       system_prompt: Optional[str] = None,
+                                       max_tokens: int = 4000) -> str:
         """
         Generate a response from Claude based on conversation history.
         
@@ -141,51 +150,77 @@ class ClaudeAPIClient(BaseAPIClient):
         Returns:
             The text response from Claude.
         """
+        # Report a request the provider would reject like any other API error
         try:
-            # Default system prompt for programming assistance if none provided
-            default_system_prompt = """
-            You are an AI programming assistant. Your goal is to help with programming tasks
-            by providing clear, correct, and well-explained code and technical information.
-            When writing code, include helpful comments. For beginners, explain concepts
-            thoroughly and avoid jargon. Focus on Python programming best practices.
-            """
-            
-            # Use provided system prompt or default
-            system_instruction = system_prompt or default_system_prompt
-            
-            # Prepare the API request
-            headers = {
-                "Content-Type": "application/json",
-                "x-api-key": self.api_key,
-                "anthropic-version": "2023-06-01"
-            }
-            
-            data = {
-                "model": self.model,
-                "system": system_instruction,
-                "max_tokens": max_tokens,
-                "messages": messages
-            }
-            
-            # Make the API call
-            response = requests.post(
-                self.api_endpoint,
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
-            
-            # Extract and return the response text
-            return result["content"][0]["text"]
+            self._validate_request(max_tokens, messages=messages)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Send only as much history as the token budget allows
+        messages = self._trim_history(messages)
+        
+        # Answer a repeated request from the cache without calling the API
+        cache_key = self._cache_key(messages, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Collect the streamed text into the complete response
+            text = "".join(self._stream_messages(messages, system_prompt, max_tokens))
+            return self._store_response(cache_key, text)
         
         except Exception as e:
             # Handle API errors
-            error_msg = f"Error when calling Claude API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
\ No newline at end of file
+            return self._error_response(e)
+    
+    def _stream_messages(self, 
+                         messages: List[Dict[str, str]], 
+                         system_prompt: Optional[str],
+                         max_tokens: int) -> Iterator[str]:
+        """
+        Send a streaming request to the Claude API and yield the text deltas.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide Claude's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from Claude.
+        """
+        # Use provided system prompt or default
+        system_instruction = system_prompt or DEFAULT_SYSTEM_PROMPT
+        
+        # Mark the system prompt and the conversation so far as cacheable, so
+        # the next turn reuses the prefix Anthropic has already processed
+        # instead of paying for it again
+        system = [{"type": "text", "text": system_instruction, "cache_control": _CACHE_CONTROL}]
+        if len(messages) > 1:
+            messages = messages[:-1] + [_with_cache_control(messages[-1])]
+        
+        # Prepare the API request
+        data = {
+            "model": self.model,
+            "system": system,
+            "max_tokens": max_tokens,
+            "messages": messages,
+            "stream": True
+        }
+        
+        # Make the API call, reading the server-sent events as they arrive
+        with self._post(
+            self.api_endpoint,
+            headers=self._base_headers,
+            data=encode_json(data),
+            stream=True
+        ) as response:
+            for event in iter_sse_events(response):
+                event_type = event.get("type")
+                
+                if event_type == "content_block_delta":
+                    text = event["delta"].get("text")
+                    if text:
+                        yield text
+                elif event_type == "error":
+                    raise ProviderError(self.provider_name, event["error"].get("message", "Unknown streaming error"))
\ No newline at end of file
@@ -2,34 +2,71 @@
 Client for interacting with the Google Gemini API.
 """
 import os
-import requests
-from typing import Dict, Any, Optional, List
-from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, List, Iterator
 
-from .base_client import BaseAPIClient
+from .base_client import BaseAPIClient, single_flight, encode_json, iter_sse_events
+from ..response_cache import ResponseCache
+
+# Sampling settings sent with every request, serialized once; the request body
+# is the contents and max_tokens substituted into this template
+_GENERATION_SETTINGS = {"temperature": 0.7, "topP": 0.95, "topK": 40}
+_BODY_TEMPLATE = (
+    b'{"contents":%b,"generationConfig":{"maxOutputTokens":%d,'
+    + encode_json(_GENERATION_SETTINGS)[1:]
+    + b'}'
+)
+
+def _to_contents(messages: List[Dict[str, str]], system_prompt: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Convert a conversation to Gemini's contents format.
+    
+    Args:
+        messages: List of message objects with 'role' and 'content' keys.
+        system_prompt: Optional system prompt, sent as the first user turn.
+        
+    Returns:
+        The contents list for a generateContent request.
+    """
+    # Add system prompt as a special type of user message if provided; it
+    # goes in first so the turns are appended once, without a shift or copy
+    contents = [{"role": "user", "parts": [{"text": f"System: {system_prompt}"}]}] if system_prompt else []
+    contents.extend(
+        {"role": "user" if msg["role"] == "user" else "model", "parts": [{"text": msg["content"]}]}
+        for msg in messages
+    )
+    return contents
+
+def _candidate_text(result: Dict[str, Any]) -> str:
+    """
+    Extract the text of the first candidate from a generateContent response.
+    
+    Args:
+        result: The decoded response.
+        
+    Returns:
+        The response text.
+    """
+    return result["candidates"][0]["content"]["parts"][0]["text"]
 
 class GeminiAPIClient(BaseAPIClient):
     """
     Client for interacting with the Google Gemini API.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    __slots__ = ("api_base", "_stream_endpoint")
+    
+    provider_name = "Gemini"
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """
         Initialize the Gemini API client.
         
         Args:
             api_key: Gemini API key. If not provided, it will be read from
                     the environment variable or .env file.
+            cache: Optional response cache shared with other clients.
         """
-        super().__init__(api_key)
-        
-        # Try to load from .env file explicitly
-        project_root = Path(__file__).resolve().parent.parent.parent
-        env_path = project_root / '.env'
-        
-        # Load the .env file
-        load_dotenv(dotenv_path=env_path)
+        super().__init__(api_key, cache)
         
         # Try to get the API key
         if not self.api_key:
@@ -47,6 +84,10 @@ class GeminiAPIClient(BaseAPIClient):
         
         # API endpoint base
         self.api_base = "https://generativelanguage.googleapis.com/v1beta/models"
+        self._update_endpoint()
+        
+        # Request headers are the same for every call, so build them once
+        self._base_headers = {"Content-Type": "application/json"}
     
     def set_model(self, model_name: str) -> None:
         """
@@ -56,7 +97,14 @@ class GeminiAPIClient(BaseAPIClient):
             model_name: The name of the Gemini model to use.
         """
         self.model = model_name
+        self._update_endpoint()
+    
+    def _update_endpoint(self) -> None:
+        """Build the generateContent endpoints for the current model and key."""
+        self.api_endpoint = f"{self.api_base}/{self.model}:generateContent?key={self.api_key}"
+        self._stream_endpoint = f"{self.api_base}/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
     
+    @single_flight
     def generate_response(self, 
                           prompt: str, 
                           system_prompt: Optional[str] = None, 
@@ -72,53 +120,42 @@ class GeminiAPIClient(BaseAPIClient):
         Returns:
             The text response from Gemini.
         """
+        # Report a request the provider would reject like any other API error
         try:
-            # Construct the API endpoint for the specified model
-            api_endpoint = f"{self.api_base}/{self.model}:generateContent?key={self.api_key}"
-            
-            # Prepare the request data
-            data = {
-                "contents": [
-                    {
-                        "parts": [
-                            {"text": prompt}
-                        ]
-                    }
-                ],
-                "generationConfig": {
-                    "maxOutputTokens": max_tokens,
-                    "temperature": 0.7,
-                    "topP": 0.95,
-                    "topK": 40
-                }
-            }
+            self._validate_request(max_tokens, prompt=prompt)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Answer a repeated or reworded request from the caches without calling the API
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is None:
+            cached = self._similar_response(prompt, system_prompt, max_tokens)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Prepare the request contents
+            parts = [{"text": prompt}]
             
             # Add system prompt if provided
             if system_prompt:
-                data["contents"][0]["parts"].insert(0, {"text": f"System: {system_prompt}"})
-            
-            # Make the API call
-            response = requests.post(
-                api_endpoint,
-                json=data
-            )
+                parts.insert(0, {"text": f"System: {system_prompt}"})
+            contents = [{"parts": parts}]
             
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
+            # Make the API call and parse the response
+            result = self._post_json(self.api_endpoint, _BODY_TEMPLATE % (encode_json(contents), max_tokens))
             
             # Extract and return the response text
-            return result["candidates"][0]["content"]["parts"][0]["text"]
+            text = _candidate_text(result)
+            self._store_similar(prompt, system_prompt, max_tokens, text)
+            return self._store_response(cache_key, text)
         
         except Exception as e:
             # Handle API errors
-            error_msg = f"Error when calling Gemini API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
+            return self._error_response(e)
     
+    @single_flight
     def generate_response_with_history(self, 
                                        messages: List[Dict[str, str]], 
                                        system_prompt: Optional[str] = None,
@@ -134,56 +171,63 @@ class GeminiAPIClient(BaseAPIClient):
         Returns:
             The text response from Gemini.
         """
+        # Report a request the provider would reject like any other API error
+        try:
+            self._validate_request(max_tokens, messages=messages)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Send only as much history as the token budget allows
+        messages = self._trim_history(messages)
+        
+        # Answer a repeated request from the cache without calling the API
+        cache_key = self._cache_key(messages, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Construct the API endpoint for the specified model
-            api_endpoint = f"{self.api_base}/{self.model}:generateContent?key={self.api_key}"
-            
             # Convert messages to Gemini format
-            contents = []
-            
-            for msg in messages:
-                role = "user" if msg["role"] == "user" else "model"
-                contents.append({
-                    "role": role,
-                    "parts": [{"text": msg["content"]}]
-                })
-            
-            # Add system prompt as a special type of user message if provided
-            if system_prompt:
-                contents.insert(0, {
-                    "role": "user",
-                    "parts": [{"text": f"System: {system_prompt}"}]
-                })
-            
-            # Prepare the request data
-            data = {
-                "contents": contents,
-                "generationConfig": {
-                    "maxOutputTokens": max_tokens,
-                    "temperature": 0.7,
-                    "topP": 0.95,
-                    "topK": 40
-                }
-            }
-            
-            # Make the API call
-            response = requests.post(
-                api_endpoint,
-                json=data
-            )
+            contents = _to_contents(messages, system_prompt)
             
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
+            # Make the API call and parse the response
+            result = self._post_json(self.api_endpoint, _BODY_TEMPLATE % (encode_json(contents), max_tokens))
             
             # Extract and return the response text
-            return result["candidates"][0]["content"]["parts"][0]["text"]
+            return self._store_response(cache_key, _candidate_text(result))
         
         except Exception as e:
             # Handle API errors
-            error_msg = f"Error when calling Gemini API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
\ No newline at end of file
+            return self._error_response(e)
+    
+    def _stream_messages(self, 
+                         messages: List[Dict[str, str]], 
+                         system_prompt: Optional[str],
+                         max_tokens: int) -> Iterator[str]:
+        """
+        Send a streaming request to the Gemini API and yield the text as it arrives.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide the model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from Gemini.
+        """
+        body = _BODY_TEMPLATE % (encode_json(_to_contents(messages, system_prompt)), max_tokens)
+        
+        # Make the API call, reading the server-sent events as they arrive
+        with self._post(
+            self._stream_endpoint,
+            headers=self._base_headers,
+            data=body,
+            stream=True
+        ) as response:
+            # Each event is a partial response carrying the next piece of text
+            for event in iter_sse_events(response):
+                for candidate in event.get("candidates", ()):
+                    for part in candidate.get("content", {}).get("parts", ()):
+                        text = part.get("text")
+                        if text:
+                            yield text
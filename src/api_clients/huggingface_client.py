@@ -2,34 +2,55 @@
 Client for interacting with the Hugging Face API.
 """
 import os
-import requests
-from typing import Dict, Any, Optional, List
-from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, List, Iterator
 
-from .base_client import BaseAPIClient
+from .base_client import BaseAPIClient, ProviderError, single_flight, encode_json, iter_sse_events
+from ..response_cache import ResponseCache
+
+def _to_conversation(messages: List[Dict[str, str]], system_prompt: Optional[str]) -> str:
+    """
+    Render a conversation as the plain-text prompt sent to the model.
+    """
+    # Add system prompt at the beginning if provided; the turns follow it in
+    # one list that is joined once rather than grown one turn at a time
+    turns = [f"System: {system_prompt}"] if system_prompt else []
+    turns.extend(
+        f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+        for msg in messages
+    )
+    
+    # Add final prompt for assistant to respond
+    turns.append("Assistant: ")
+    return "\n\n".join(turns)
+
+def _format_prompt(prompt: str, system_prompt: Optional[str]) -> str:
+    """
+    Render a single prompt as the text sent to the model.
+    """
+    if system_prompt:
+        # Format depends on model, this is a common format for instruction models
+        return f"<s>[INST] {system_prompt}\n\n{prompt} [/INST]</s>"
+    return prompt
 
 class HuggingFaceAPIClient(BaseAPIClient):
     """
     Client for interacting with the Hugging Face API.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    __slots__ = ("_model_endpoint",)
+    
+    provider_name = "Hugging Face"
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
         """
         Initialize the Hugging Face API client.
         
         Args:
             api_key: Hugging Face API key. If not provided, it will be read from
                     the environment variable or .env file.
+            cache: Optional response cache shared with other clients.
         """
-        super().__init__(api_key)
-        
-        # Try to load from .env file explicitly
-        project_root = Path(__file__).resolve().parent.parent.parent
-        env_path = project_root / '.env'
-        
-        # Load the .env file
-        load_dotenv(dotenv_path=env_path)
+        super().__init__(api_key, cache)
         
         # Try to get the API key
         if not self.api_key:
@@ -47,6 +68,13 @@ class HuggingFaceAPIClient(BaseAPIClient):
         
         # API endpoint
         self.api_endpoint = "https://api-inference.huggingface.co/models"
+        self._update_endpoint()
+        
+        # Request headers are the same for every call, so build them once
+        self._base_headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
     
     def set_model(self, model_name: str) -> None:
         """
@@ -56,7 +84,13 @@ class HuggingFaceAPIClient(BaseAPIClient):
             model_name: The name or path of the Hugging Face model to use.
         """
         self.model = model_name
+        self._update_endpoint()
     
+    def _update_endpoint(self) -> None:
+        """Build the inference endpoint for the current model."""
+        self._model_endpoint = f"{self.api_endpoint}/{self.model}"
+    
+    @single_flight
     def generate_response(self, 
                           prompt: str, 
                           system_prompt: Optional[str] = None, 
@@ -72,53 +106,46 @@ class HuggingFaceAPIClient(BaseAPIClient):
         Returns:
             The text response from the model.
         """
+        # Report a request the provider would reject like any other API error
+        try:
+            self._validate_request(max_tokens, prompt=prompt)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Answer a repeated or reworded request from the caches without calling the API
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is None:
+            cached = self._similar_response(prompt, system_prompt, max_tokens)
+        if cached is not None:
+            return cached
+        
         try:
-            # Construct full prompt with system prompt if provided
-            full_prompt = prompt
-            if system_prompt:
-                # Format depends on model, this is a common format for instruction models
-                full_prompt = f"<s>[INST] {system_prompt}\n\n{prompt} [/INST]</s>"
-            
             # Prepare the API request
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             data = {
-                "inputs": full_prompt,
+                "inputs": _format_prompt(prompt, system_prompt),
                 "parameters": {
                     "max_new_tokens": max_tokens,
                     "return_full_text": False
                 }
             }
             
-            # Make the API call to the specific model endpoint
-            response = requests.post(
-                f"{self.api_endpoint}/{self.model}",
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
+            # Make the API call to the specific model endpoint and parse the response
+            result = self._post_json(self._model_endpoint, encode_json(data))
             
             # Extract the generated text (format varies by model)
             if isinstance(result, list) and result:
-                return result[0].get("generated_text", "")
+                text = result[0].get("generated_text", "")
+                self._store_similar(prompt, system_prompt, max_tokens, text)
+                return self._store_response(cache_key, text)
             
             return "No response generated from the model."
         
         except Exception as e:
             # Handle API errors
-            error_msg = f"Error when calling Hugging Face API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
+            return self._error_response(e)
     
+    @single_flight
     def generate_response_with_history(self, 
                                        messages: List[Dict[str, str]], 
                                        system_prompt: Optional[str] = None,
@@ -134,28 +161,26 @@ class HuggingFaceAPIClient(BaseAPIClient):
         Returns:
             The text response from the model.
         """
+        # Report a request the provider would reject like any other API error
+        try:
+            self._validate_request(max_tokens, messages=messages)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Send only as much history as the token budget allows
+        messages = self._trim_history(messages)
+        
+        # Answer a repeated request from the cache without calling the API
+        cache_key = self._cache_key(messages, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Convert message history to a text conversation format
-            conversation = ""
-            
-            # Add system prompt at the beginning if provided
-            if system_prompt:
-                conversation += f"System: {system_prompt}\n\n"
-            
-            # Format conversation history
-            for msg in messages:
-                role = "User" if msg["role"] == "user" else "Assistant"
-                conversation += f"{role}: {msg['content']}\n\n"
-            
-            # Add final prompt for assistant to respond
-            conversation += "Assistant: "
+            conversation = _to_conversation(messages, system_prompt)
             
             # Prepare the API request
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             data = {
                 "inputs": conversation,
                 "parameters": {
@@ -164,28 +189,85 @@ class HuggingFaceAPIClient(BaseAPIClient):
                 }
             }
             
-            # Make the API call to the specific model endpoint
-            response = requests.post(
-                f"{self.api_endpoint}/{self.model}",
-                headers=headers,
-                json=data
-            )
-            
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Parse the response
-            result = response.json()
+            # Make the API call to the specific model endpoint and parse the response
+            result = self._post_json(self._model_endpoint, encode_json(data))
             
             # Extract the generated text (format varies by model)
             if isinstance(result, list) and result:
-                return result[0].get("generated_text", "")
+                return self._store_response(cache_key, result[0].get("generated_text", ""))
             
             return "No response generated from the model."
         
         except Exception as e:
             # Handle API errors
-            error_msg = f"Error when calling Hugging Face API: {str(e)}"
-            print(error_msg)
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"API response: {e.response.text}")
-            return f"I encountered an error: {error_msg}. Please check your API key and network connection."
\ No newline at end of file
+            return self._error_response(e)
+    
+    def _stream_prompt(self, 
+                       prompt: str, 
+                       system_prompt: Optional[str],
+                       max_tokens: int) -> Iterator[str]:
+        """
+        Stream the response to a single prompt, formatted as in generate_response.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide the model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        yield from self._stream_inputs(_format_prompt(prompt, system_prompt), max_tokens)
+    
+    def _stream_messages(self, 
+                         messages: List[Dict[str, str]], 
+                         system_prompt: Optional[str],
+                         max_tokens: int) -> Iterator[str]:
+        """
+        Stream the response to a conversation, formatted as in generate_response_with_history.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide the model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        yield from self._stream_inputs(_to_conversation(messages, system_prompt), max_tokens)
+    
+    def _stream_inputs(self, inputs: str, max_tokens: int) -> Iterator[str]:
+        """
+        Send a streaming request to the model endpoint and yield the generated tokens.
+        
+        Args:
+            inputs: The formatted text the model continues.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the model.
+        """
+        data = {
+            "inputs": inputs,
+            "parameters": {
+                "max_new_tokens": max_tokens,
+                "return_full_text": False
+            },
+            "stream": True
+        }
+        
+        # Make the API call, reading the server-sent events as they arrive
+        with self._post(
+            self._model_endpoint,
+            headers=self._base_headers,
+            data=encode_json(data),
+            stream=True
+        ) as response:
+            for event in iter_sse_events(response):
+                if "error" in event:
+                    raise ProviderError(self.provider_name, event["error"])
+                
+                # Special tokens such as the end-of-sequence marker are not text
+                token = event.get("token") or {}
+                if token.get("text") and not token.get("special"):
+                    yield token["text"]
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Shared client for providers that expose an OpenAI-compatible chat completions API.
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Iterator
+
+from .base_client import BaseAPIClient, ProviderError, single_flight, DEFAULT_SYSTEM_PROMPT, encode_json, iter_sse_events
+from ..response_cache import ResponseCache
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """
+    Settings that distinguish one OpenAI-compatible provider from another.
+    """
+    name: str                                 # Display name used in messages
+    api_key_env: str                          # Environment variable holding the API key
+    model_env: str                            # Environment variable overriding the default model
+    default_model: str
+    api_endpoint: str
+    use_default_system_prompt: bool = False   # Send DEFAULT_SYSTEM_PROMPT when none is given
+
+class OpenAICompatibleClient(BaseAPIClient):
+    """
+    Client for any provider with an OpenAI-compatible chat completions API.
+    
+    Subclasses set spec to describe their provider; building requests and
+    reading the streamed responses is shared.
+    """
+    
+    __slots__ = ()
+    
+    spec: ProviderSpec
+    
+    @property
+    def provider_name(self) -> str:
+        """Name of the provider in error messages."""
+        return self.spec.name
+    
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[ResponseCache] = None):
+        """
+        Initialize the API client.
+        
+        Args:
+            api_key: API key for the provider. If not provided, it will be read from
+                    the environment variable or .env file.
+            cache: Optional response cache shared with other clients.
+        """
+        super().__init__(api_key, cache)
+        spec = self.spec
+        
+        # Try to get the API key
+        if not self.api_key:
+            self.api_key = os.getenv(spec.api_key_env)
+        
+        # Verify that we have an API key
+        if not self.api_key:
+            raise ValueError(
+                f"{spec.name} API key not found. Please provide an API key or set the {spec.api_key_env} "
+                "environment variable in your .env file."
+            )
+        
+        # Set default model
+        self.model = os.getenv(spec.model_env, spec.default_model)
+        
+        # API endpoint
+        self.api_endpoint = spec.api_endpoint
+        
+        # Request headers are the same for every call, so build them once
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+    
+    def set_model(self, model_name: str) -> None:
+        """
+        Set the model to use for queries.
+        
+        Args:
+            model_name: The name of the model to use.
+        """
+        self.model = model_name
+    
+    @single_flight
+    def generate_response(self, 
+                          prompt: str, 
+                          system_prompt: Optional[str] = None, 
+                          max_tokens: int = 4000) -> str:
+        """
+        Generate a response from the provider based on the prompt.
+        
+        Args:
+            prompt: The user's message/query.
+            system_prompt: Optional system prompt to guide the model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Returns:
+            The text response from the provider.
+        """
+        # Report a request the provider would reject like any other API error
+        try:
+            self._validate_request(max_tokens, prompt=prompt)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Answer a repeated or reworded request from the caches without calling the API
+        cache_key = self._cache_key(prompt, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is None:
+            cached = self._similar_response(prompt, system_prompt, max_tokens)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Collect the streamed text into the complete response
+            text = "".join(self._stream_messages(
+                [{"role": "user", "content": prompt}],
+                system_prompt,
+                max_tokens
+            ))
+            self._store_similar(prompt, system_prompt, max_tokens, text)
+            return self._store_response(cache_key, text)
+        
+        except Exception as e:
+            # Handle API errors
+            return self._error_response(e)
+    
+    @single_flight
+    def generate_response_with_history(self, 
+                                       messages: List[Dict[str, str]], 
+                                       system_prompt: Optional[str] = None,
+                                       max_tokens: int = 4000) -> str:
+        """
+        Generate a response from the provider based on conversation history.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide the model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Returns:
+            The text response from the provider.
+        """
+        # Report a request the provider would reject like any other API error
+        try:
+            self._validate_request(max_tokens, messages=messages)
+        except ValueError as e:
+            return self._error_response(e)
+        
+        # Send only as much history as the token budget allows
+        messages = self._trim_history(messages)
+        
+        # Answer a repeated request from the cache without calling the API
+        cache_key = self._cache_key(messages, system_prompt, max_tokens)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            # Collect the streamed text into the complete response
+            text = "".join(self._stream_messages(messages, system_prompt, max_tokens))
+            return self._store_response(cache_key, text)
+        
+        except Exception as e:
+            # Handle API errors
+            return self._error_response(e)
+    
+    def _stream_messages(self, 
+                         messages: List[Dict[str, str]], 
+                         system_prompt: Optional[str],
+                         max_tokens: int) -> Iterator[str]:
+        """
+        Send a streaming request to the provider's chat completions API and yield the text deltas.
+        
+        Args:
+            messages: List of message objects with 'role' and 'content' keys.
+            system_prompt: Optional system prompt to guide the model's behavior.
+            max_tokens: Maximum number of tokens in the response.
+            
+        Yields:
+            Successive pieces of the text response from the provider.
+        """
+        # Some providers always get a system prompt, falling back to the default
+        system_instruction = system_prompt
+        if not system_instruction and self.spec.use_default_system_prompt:
+            system_instruction = DEFAULT_SYSTEM_PROMPT
+        
+        # Prepare message list with the system prompt, if any, at the beginning
+        if system_instruction:
+            chat_messages = [{"role": "system", "content": system_instruction}, *messages]
+        else:
+            # Nothing to prepend, so the history is sent without copying it
+            chat_messages = messages
+        
+        data = {
+            "model": self.model,
+            "messages": chat_messages,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        
+        # Make the API call, reading the server-sent events as they arrive
+        with self._post(
+            self.api_endpoint,
+            headers=self._base_headers,
+            data=encode_json(data),
+            stream=True
+        ) as response:
+            for event in iter_sse_events(response):
+                if "error" in event:
+                    raise ProviderError(self.provider_name, event["error"].get("message", "Unknown streaming error"))
+                
+                # Each chunk carries the next piece of text in its choice's delta
+                for choice in event.get("choices", ()):
+                    text = choice.get("delta", {}).get("content")
+                    if text:
+                        yield text
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Circuit breaker for AI provider requests.
+Stops sending requests to a provider that keeps failing, so an outage costs
+one quick error per call instead of a full round of retries each time.
+"""
+import time
+from threading import Lock
+
+
+class CircuitBreaker:
+    """
+    Breaker that opens after repeated failures and lets a trial request through once it has cooled down.
+    """
+    
+    __slots__ = ("fail_max", "reset_timeout", "failures", "opened_at", "_lock")
+    
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30):
+        """
+        Initialize the circuit breaker, starting closed.
+        
+        Args:
+            fail_max: Consecutive failures after which the breaker opens.
+            reset_timeout: Seconds the breaker stays open before a trial request is allowed.
+        """
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        # Monotonic time the breaker opened, or None while it is closed
+        self.opened_at = None
+        # Clients on different threads (see multi_query) may share one breaker
+        self._lock = Lock()
+    
+    def allow(self) -> float:
+        """
+        Check whether a request may be sent.
+        
+        Once the breaker has been open for reset_timeout seconds, one caller
+        is let through as a trial; its outcome closes or reopens the breaker.
+        
+        Returns:
+            0 if the request may be sent, otherwise the number of seconds
+            until the next trial request will be allowed.
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            now = time.monotonic()
+            remaining = self.opened_at + self.reset_timeout - now
+            if remaining > 0:
+                return remaining
+            # Restart the timeout so other callers wait while the trial runs,
+            # and get their own trial if it never reports back
+            self.opened_at = now
+            return 0.0
+    
+    def record_success(self) -> None:
+        """Record a request that reached the provider, closing the breaker."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker once fail_max is reached."""
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                self.opened_at = time.monotonic()
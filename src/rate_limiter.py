@@ -0,0 +1,53 @@
+"""
+Client-side rate limiting for AI provider requests.
+Spaces out requests so bursts stay within a provider's limits instead of
+being rejected with 429 responses and retried.
+"""
+import time
+from threading import Lock
+
+
+class TokenBucket:
+    """
+    Token bucket that lets short bursts through and then holds requests to a steady rate.
+    """
+    
+    __slots__ = ("rate", "capacity", "tokens", "ts", "_lock")
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize the token bucket, starting full.
+        
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum number of tokens the bucket holds, i.e. the largest burst.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.ts = time.monotonic()
+        # Clients on different threads (see multi_query) may share one bucket
+        self._lock = Lock()
+    
+    def acquire(self, n: float = 1) -> float:
+        """
+        Take tokens from the bucket, waiting until they are available.
+        
+        Args:
+            n: Number of tokens to take.
+        
+        Returns:
+            The number of seconds spent waiting.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.ts) * self.rate)
+            self.ts = now
+            # Taking the tokens now reserves them, so concurrent callers queue
+            # up behind each other instead of all waking at the same moment
+            self.tokens -= n
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,255 @@
+"""
+In-memory cache for AI model responses.
+Lets API clients answer a repeated request without calling the provider again.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of response texts keyed by the request that produced them.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 3600):
+        """
+        Initialize the response cache.
+        
+        Args:
+            max_entries: Maximum number of responses to keep; the least recently
+                         used response is evicted once the cache is full.
+            ttl: Seconds a response stays valid, or None to keep it until evicted.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Maps each key to (response, expiry time on the monotonic clock)
+        self._entries = OrderedDict()
+        # Clients on different threads (see multi_query) may share one cache
+        self._lock = Lock()
+    
+    @staticmethod
+    def make_key(provider: str,
+                 model: str,
+                 system_prompt: Optional[str],
+                 prompt: Any,
+                 max_tokens: int) -> str:
+        """
+        Build the cache key for a request.
+        
+        Args:
+            provider: Name of the AI provider.
+            model: The model the request is sent to.
+            system_prompt: The system prompt, if any.
+            prompt: The user's prompt, or the list of messages for a conversation.
+            max_tokens: Maximum number of tokens in the response.
+        
+        Returns:
+            A hex digest identifying the request.
+        """
+        if not isinstance(prompt, str):
+            # Compact separators keep the text to hash short for long histories
+            prompt = json.dumps(prompt, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        # Unit separators keep the fields from running into each other
+        raw = "\x1f".join((provider, model, system_prompt or "", prompt, str(max_tokens)))
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key returned by make_key.
+        
+        Returns:
+            The cached response text, or None if the request has not been seen.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+    
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the least recently used one if the cache is full.
+        
+        Args:
+            key: Key returned by make_key.
+            response: The response text to cache.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (response, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+    
+    def close(self) -> None:
+        """Release what the cache holds open; the in-memory cache holds nothing."""
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Default location of the on-disk cache, under the project's data directory
+_DISK_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'llm_cache.sqlite3'
+)
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    Response cache stored in an SQLite database, so responses survive restarts.
+    """
+    
+    def __init__(self, 
+                 path: str = _DISK_CACHE_PATH, 
+                 ttl: Optional[float] = 3600, 
+                 max_entries: int = 10_000):
+        """
+        Initialize the disk cache, creating the database if needed.
+        
+        Args:
+            path: Path of the SQLite database file.
+            ttl: Seconds a response stays valid, or None to keep it until evicted.
+            max_entries: Maximum number of responses to keep; the oldest stored
+                         responses are evicted once the cache is full.
+        """
+        super().__init__(max_entries, ttl)
+        self.path = path
+        self._db = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            self._connect()
+    
+    def _connect(self):
+        """
+        Return the database connection, opening it if it is not open.
+        
+        Callers hold self._lock.
+        """
+        if self._db is None:
+            # sqlite3 is only needed when the disk backend is chosen
+            import sqlite3
+            
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            with self._db:
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL)"
+                )
+                # Drop what expired since the last run so the file does not keep growing
+                self._db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        return self._db
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Key returned by make_key.
+        
+        Returns:
+            The cached response text, or None if the request has not been seen
+            or its response has expired.
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT response, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row[0]
+    
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, evicting the oldest ones if the cache is full.
+        
+        Args:
+            key: Key returned by make_key.
+            response: The response text to cache.
+        """
+        # Wall-clock expiry, since the monotonic clock restarts with the process
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, expires) VALUES (?, ?, ?)",
+                    (key, response, expires)
+                )
+                # Every write gets a higher rowid than the rows before it, so
+                # everything more than max_entries writes old can go in one
+                # indexed delete, without counting or sorting the table
+                db.execute(
+                    "DELETE FROM responses WHERE rowid <= (SELECT MAX(rowid) FROM responses) - ?",
+                    (self.max_entries,)
+                )
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM responses")
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        
+        The cache stays usable; the next lookup or store reopens the database.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+# Cache chosen by LLM_CACHE_BACKEND, created on first use and shared by all clients
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = Lock()
+
+
+def default_cache() -> Optional[ResponseCache]:
+    """
+    Return the cache selected by the LLM_CACHE_BACKEND environment variable.
+    
+    "memory" selects an in-memory cache and "disk" an SQLite cache under the
+    project's data directory; unset or "none" disables caching.
+    
+    Returns:
+        The shared cache, or None if caching is disabled.
+    """
+    global _DEFAULT_CACHE
+    backend = os.getenv('LLM_CACHE_BACKEND', 'none').lower()
+    if backend == 'none':
+        return None
+    
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            if backend == 'memory':
+                _DEFAULT_CACHE = ResponseCache()
+            elif backend == 'disk':
+                _DEFAULT_CACHE = DiskResponseCache()
+            else:
+                raise ValueError(f"Unsupported LLM_CACHE_BACKEND: {backend}")
+        return _DEFAULT_CACHE
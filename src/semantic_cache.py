@@ -0,0 +1,140 @@
+"""
+Similarity cache for AI model responses.
+Answers a prompt that closely matches an earlier one, such as the same question
+reworded or re-punctuated, with the response to the earlier prompt.
+"""
+import math
+import re
+from collections import Counter, OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+# Words of a prompt; punctuation and case are ignored when comparing prompts
+_WORD_RE = re.compile(r"\w+")
+
+
+def embed(text: str) -> Dict[str, float]:
+    """
+    Build a unit-length vector of the character trigrams in a text.
+    
+    Trigrams make inflected or possessive forms of a word ("France", "France's")
+    share most of their features, so rewordings still score close to each other.
+    
+    Args:
+        text: The text to embed.
+    
+    Returns:
+        A sparse vector mapping each trigram to its normalized weight.
+    """
+    counts = Counter()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f" {word} "
+        counts.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    if not norm:
+        return {}
+    return {gram: count / norm for gram, count in counts.items()}
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """
+    Cosine similarity of two vectors returned by embed.
+    
+    Args:
+        a: The first vector.
+        b: The second vector.
+    
+    Returns:
+        The similarity, from 0 for no shared trigrams to 1 for identical texts.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(gram, 0.0) for gram, weight in a.items())
+
+
+class SemanticCache:
+    """
+    Cache of response texts that matches prompts by similarity instead of exact text.
+    """
+    
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256):
+        """
+        Initialize the similarity cache.
+        
+        Args:
+            threshold: Minimum cosine similarity for a cached prompt to count as a match.
+            max_entries: Maximum number of prompts to keep per request scope; the
+                         least recently used one is evicted once the scope is full.
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Maps each scope to an OrderedDict of prompt -> (vector, response)
+        self._scopes: Dict[str, "OrderedDict[str, Tuple[Dict[str, float], str]]"] = {}
+        # Clients on different threads (see multi_query) may share one cache
+        self._lock = Lock()
+    
+    def search(self, scope: str, prompt: str) -> Optional[str]:
+        """
+        Find the response to the cached prompt most similar to a prompt.
+        
+        Args:
+            scope: Key identifying the provider, model and request settings; only
+                   prompts cached under the same scope are compared.
+            prompt: The user's prompt.
+        
+        Returns:
+            The response to the best match, or None if no cached prompt
+            reaches the similarity threshold.
+        """
+        vector = embed(prompt)
+        with self._lock:
+            entries = self._scopes.get(scope)
+            best_prompt, best_score = None, self.threshold
+            if entries and vector:
+                for cached_prompt, (cached_vector, _) in entries.items():
+                    score = cosine(vector, cached_vector)
+                    if score >= best_score:
+                        best_prompt, best_score = cached_prompt, score
+            
+            if best_prompt is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entries.move_to_end(best_prompt)
+            return entries[best_prompt][1]
+    
+    def add(self, scope: str, prompt: str, response: str) -> None:
+        """
+        Store the response to a prompt.
+        
+        Args:
+            scope: Key identifying the provider, model and request settings.
+            prompt: The user's prompt.
+            response: The response text to cache.
+        """
+        vector = embed(prompt)
+        if not vector:
+            return
+        with self._lock:
+            entries = self._scopes.setdefault(scope, OrderedDict())
+            entries[prompt] = (vector, response)
+            entries.move_to_end(prompt)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of lookups that found a match and that did not.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._scopes.clear()
+    
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._scopes.values())
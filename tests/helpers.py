@@ -0,0 +1,24 @@
+"""
+Shared helpers for the unit tests.
+"""
+
+
+class FakeClock:
+    """Stand-in for the time module whose clocks only move when told to or slept on."""
+    
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps = []
+    
+    def time(self) -> float:
+        return self.now
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
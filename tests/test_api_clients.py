@@ -0,0 +1,299 @@
+"""
+Unit tests for the provider API clients.
+Tests request validation and the shared request handling in BaseAPIClient.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api_clients import create_api_client
+from src.api_clients import base_client
+
+
+class TestRequestValidation(unittest.TestCase):
+    """Test cases for requests rejected before they reach the provider."""
+    
+    def setUp(self):
+        """Create one client for each provider family."""
+        self.clients = [create_api_client(provider, "mock_api_key")
+                        for provider in ("claude", "gemini", "huggingface", "grok")]
+    
+    def test_oversized_max_tokens_returns_error_text(self):
+        """An out-of-range max_tokens is reported in the response instead of raised."""
+        for client in self.clients:
+            with self.subTest(client=type(client).__name__), \
+                 patch.object(type(client), "_post") as mock_post:
+                response = client.generate_response("Hello", max_tokens=10_000_000)
+                
+                self.assertTrue(response.startswith("I encountered an error:"))
+                self.assertIn("max_tokens", response)
+                mock_post.assert_not_called()
+    
+    def test_oversized_history_returns_error_text(self):
+        """A message over the prompt limit is reported in the response instead of raised."""
+        length = 1_000_001
+        messages = [{"role": "user", "content": "x" * length}]
+        for client in self.clients:
+            with self.subTest(client=type(client).__name__), \
+                 patch.object(type(client), "_post") as mock_post:
+                response = client.generate_response_with_history(messages)
+                
+                self.assertTrue(response.startswith("I encountered an error:"))
+                self.assertIn(str(length), response)
+                mock_post.assert_not_called()
+    
+    def test_empty_history_returns_error_text(self):
+        """An empty conversation is reported in the response instead of raised."""
+        for client in self.clients:
+            with self.subTest(client=type(client).__name__):
+                response = client.generate_response_with_history([])
+                
+                self.assertTrue(response.startswith("I encountered an error:"))
+
+
+class TestClaudePromptCaching(unittest.TestCase):
+    """Test cases for the cache_control markers sent to Claude."""
+    
+    def setUp(self):
+        """Create a Claude client whose requests are captured instead of sent."""
+        self.client = create_api_client("claude", "mock_api_key")
+        self.client.cache = None
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.iter_lines.return_value = []
+        post_patch = patch.object(type(self.client), "_post", return_value=response)
+        self.post = post_patch.start()
+        self.addCleanup(post_patch.stop)
+    
+    def sent_messages(self, messages):
+        """Send a conversation and return the messages in the request body."""
+        self.client.generate_response_with_history(messages)
+        return json.loads(self.post.call_args.kwargs["data"])["messages"]
+    
+    def test_string_content_is_wrapped(self):
+        """The last message's text is sent as a cacheable text block."""
+        sent = self.sent_messages([
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+            {"role": "user", "content": "second"},
+        ])
+        
+        self.assertEqual(sent[:2], [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+        ])
+        self.assertEqual(sent[2], {
+            "role": "user",
+            "content": [{"type": "text", "text": "second", "cache_control": {"type": "ephemeral"}}]
+        })
+    
+    def test_block_content_marks_last_block(self):
+        """Content blocks are sent unchanged apart from a marker on the last one."""
+        image = {"type": "image", "source": {"type": "base64", "media_type": "image/png", "data": "AAAA"}}
+        text = {"type": "text", "text": "What is this?"}
+        messages = [
+            {"role": "user", "content": "first"},
+            {"role": "assistant", "content": "reply"},
+            {"role": "user", "content": [image, text]},
+        ]
+        
+        sent = self.sent_messages(messages)
+        
+        self.assertEqual(sent[2]["content"], [image, dict(text, cache_control={"type": "ephemeral"})])
+        # The caller's blocks are not modified
+        self.assertNotIn("cache_control", text)
+    
+    def test_single_message_is_not_marked(self):
+        """A one-message conversation has no earlier prefix worth caching."""
+        sent = self.sent_messages([{"role": "user", "content": "only"}])
+        
+        self.assertEqual(sent, [{"role": "user", "content": "only"}])
+
+class TestHuggingFacePromptFormat(unittest.TestCase):
+    """Test cases for the text sent to Hugging Face for a single prompt."""
+    
+    def setUp(self):
+        """Create a Hugging Face client whose requests are captured instead of sent."""
+        self.client = create_api_client("huggingface", "mock_api_key")
+        self.client.cache = None
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.content = b'[{"generated_text": "answer"}]'
+        response.iter_lines.return_value = [b'data: {"token": {"text": "answer", "special": false}}']
+        post_patch = patch.object(type(self.client), "_post", return_value=response)
+        self.post = post_patch.start()
+        self.addCleanup(post_patch.stop)
+    
+    def sent_inputs(self) -> str:
+        """Return the model input of the last request."""
+        return json.loads(self.post.call_args.kwargs["data"])["inputs"]
+    
+    def test_stream_sends_same_input_as_generate_response(self):
+        """A streamed prompt is formatted like generate_response, so both can share a cache entry."""
+        for system_prompt in ("Be brief.", None):
+            with self.subTest(system_prompt=system_prompt):
+                self.assertEqual(self.client.generate_response("Hello", system_prompt), "answer")
+                expected = self.sent_inputs()
+                
+                self.assertEqual("".join(self.client.generate_response_stream("Hello", system_prompt)), "answer")
+                self.assertEqual(self.sent_inputs(), expected)
+        
+        self.assertEqual(expected, "Hello")
+    
+    def test_system_prompt_format(self):
+        """A system prompt is sent in the instruction format."""
+        list(self.client.generate_response_stream("Hello", "Be brief."))
+        
+        self.assertEqual(self.sent_inputs(), "<s>[INST] Be brief.\n\nHello [/INST]</s>")
+
+
+class TestClientClose(unittest.TestCase):
+    """Test cases for closing a client."""
+    
+    def test_close_leaves_shared_session_open(self):
+        """Closing one client, directly or by leaving a with block, keeps the shared pool."""
+        session = MagicMock()
+        with patch.object(base_client, "_SESSION", session):
+            client = create_api_client("grok", "mock_api_key")
+            with client:
+                pass
+            client.close()
+            
+            self.assertIs(base_client._SESSION, session)
+        session.close.assert_not_called()
+    
+    def test_close_leaves_default_cache_open(self):
+        """The default cache other clients share is not closed with one client."""
+        shared_cache = MagicMock()
+        with patch.dict(os.environ, {"LLM_CACHE_BACKEND": "memory"}), \
+             patch("src.response_cache._DEFAULT_CACHE", shared_cache):
+            client = create_api_client("grok", "mock_api_key")
+            client.close()
+        
+        self.assertIs(client.cache, shared_cache)
+        shared_cache.close.assert_not_called()
+    
+    def test_close_closes_given_cache(self):
+        """A cache passed to the client is closed with it."""
+        cache = MagicMock()
+        with create_api_client("grok", "mock_api_key", cache=cache):
+            pass
+        
+        cache.close.assert_called_once_with()
+
+
+
+class _StreamingHandler(BaseHTTPRequestHandler):
+    """Answers every request with a slow OpenAI-style event stream."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for _ in range(40):
+                event = b'data: {"choices":[{"delta":{"content":"x"}}]}\n\n'
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+                self.wfile.flush()
+                time.sleep(0.05)
+            done = b"data: [DONE]\n\n"
+            self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(done), done))
+        except OSError:
+            # The client stopped reading
+            pass
+    
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test cases for the shared connection pool and the streams that hold its connections."""
+    
+    def setUp(self):
+        """Point a client at a local server over a session with a single pooled connection."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StreamingHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        
+        with patch.dict(os.environ, {"LLM_HTTP_POOL_MAXSIZE": "1"}):
+            self.session = base_client._create_session()
+        session_patch = patch.object(base_client, "_SESSION", self.session)
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+        timeout_patch = patch.object(base_client, "_POOL_TIMEOUT", 0.3)
+        timeout_patch.start()
+        self.addCleanup(timeout_patch.stop)
+        
+        self.client = create_api_client("grok", "pool_test_key")
+        self.client.api_endpoint = f"http://127.0.0.1:{self.server.server_port}/v1"
+    
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_full_pool_returns_error_instead_of_hanging(self):
+        """A request that finds no free connection fails after the pool timeout."""
+        stream = self.client.generate_response_stream("held")
+        next(stream)
+        
+        started = time.monotonic()
+        response = self.client.generate_response("waiting")
+        
+        self.assertIn("no free connection", response)
+        self.assertLess(time.monotonic() - started, 5)
+        stream.close()
+    
+    def test_closed_stream_releases_connection(self):
+        """Closing a half-read stream hands its connection back to the pool."""
+        stream = self.client.generate_response_stream("abandoned")
+        next(stream)
+        stream.close()
+        
+        self.assertEqual(self.client.generate_response("next"), "x" * 40)
+    
+    def test_closed_async_stream_releases_connection(self):
+        """Closing a half-read async stream hands its connection back to the pool."""
+        async def read_one_chunk():
+            stream = self.client.agenerate_response_stream("abandoned")
+            await stream.__anext__()
+            await stream.aclose()
+        
+        asyncio.run(read_one_chunk())
+        
+        self.assertEqual(self.client.generate_response("next"), "x" * 40)
+    
+    def test_cancelled_async_stream_releases_connection(self):
+        """Cancelling a consumer mid-read hands the stream's connection back to the pool."""
+        async def consume():
+            async for _ in self.client.agenerate_response_stream("cancelled"):
+                pass
+        
+        async def cancel_while_reading():
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        
+        asyncio.run(cancel_while_reading())
+        
+        self.assertEqual(self.client.generate_response("next"), "x" * 40)
+
+if __name__ == '__main__':
+    unittest.main()
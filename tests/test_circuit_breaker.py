@@ -0,0 +1,201 @@
+"""
+Unit tests for the circuit breaker.
+Tests CircuitBreaker state changes and which request failures BaseAPIClient._post counts.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+from pathlib import Path
+
+import requests
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api_clients import ProviderError, create_api_client
+from src.api_clients import base_client
+from src.circuit_breaker import CircuitBreaker
+from tests.helpers import FakeClock
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for CircuitBreaker."""
+    
+    def setUp(self):
+        """Create a breaker with a clock that only moves when the test advances it."""
+        self.clock = FakeClock()
+        clock_patch = patch("src.circuit_breaker.time", self.clock)
+        clock_patch.start()
+        self.addCleanup(clock_patch.stop)
+        self.breaker = CircuitBreaker(fail_max=3, reset_timeout=30)
+    
+    def open_breaker(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+    
+    def test_stays_closed_below_fail_max(self):
+        """Failures short of fail_max let requests through."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        
+        self.assertEqual(self.breaker.allow(), 0.0)
+    
+    def test_success_resets_failure_count(self):
+        """Only consecutive failures open the breaker."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        
+        self.assertEqual(self.breaker.allow(), 0.0)
+    
+    def test_opens_at_fail_max(self):
+        """Reaching fail_max refuses requests for the reset timeout."""
+        self.open_breaker()
+        
+        self.assertEqual(self.breaker.allow(), 30)
+        self.clock.advance(10)
+        self.assertEqual(self.breaker.allow(), 20)
+    
+    def test_half_open_lets_one_trial_through(self):
+        """After the reset timeout one request is allowed and the others keep waiting."""
+        self.open_breaker()
+        self.clock.advance(30)
+        
+        self.assertEqual(self.breaker.allow(), 0.0)
+        self.assertEqual(self.breaker.allow(), 30)
+    
+    def test_successful_trial_closes(self):
+        """A trial request that succeeds closes the breaker."""
+        self.open_breaker()
+        self.clock.advance(30)
+        self.breaker.allow()
+        self.breaker.record_success()
+        
+        self.assertEqual(self.breaker.allow(), 0.0)
+        self.assertEqual(self.breaker.allow(), 0.0)
+        self.assertEqual(self.breaker.failures, 0)
+    
+    def test_failed_trial_reopens(self):
+        """A trial request that fails opens the breaker for another full timeout."""
+        self.open_breaker()
+        self.clock.advance(30)
+        self.breaker.allow()
+        self.clock.advance(5)
+        self.breaker.record_failure()
+        
+        self.assertEqual(self.breaker.allow(), 30)
+    
+    def test_lost_trial_lets_another_through(self):
+        """A trial that never reports back does not keep the breaker open for good."""
+        self.open_breaker()
+        self.clock.advance(30)
+        self.breaker.allow()
+        self.clock.advance(30)
+        
+        self.assertEqual(self.breaker.allow(), 0.0)
+
+
+def _http_error(status_code: int) -> requests.HTTPError:
+    """Build the error raise_for_status raises for a status code."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"error body"
+    return requests.HTTPError(f"{status_code} Error", response=response)
+
+
+class TestPostFailureCounting(unittest.TestCase):
+    """Test cases for the request outcomes BaseAPIClient._post reports to its breaker."""
+    
+    def setUp(self):
+        """Create a client over a session that raises the error each test chooses."""
+        for registry in (base_client._CIRCUIT_BREAKERS, base_client._RATE_LIMITERS):
+            registry_patch = patch.dict(registry, clear=True)
+            registry_patch.start()
+            self.addCleanup(registry_patch.stop)
+        
+        self.session = MagicMock()
+        session_patch = patch.object(base_client, "_SESSION", self.session)
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+        
+        self.client = create_api_client("claude", "breaker_test_key")
+        # Keep the rate limiter from spacing out the requests
+        burst_patch = patch.object(type(self.client), "request_burst", 100)
+        burst_patch.start()
+        self.addCleanup(burst_patch.stop)
+        self.breaker = base_client._circuit_breaker(
+            type(self.client).__name__, self.client.api_key,
+            self.client.breaker_fail_max, self.client.breaker_reset_timeout
+        )
+    
+    def post_failing(self, error: Exception) -> ProviderError:
+        """Send a request that fails with an error and return what _post raised."""
+        self.session.post.side_effect = error
+        with self.assertRaises(ProviderError) as context:
+            self.client._post("https://example.invalid")
+        return context.exception
+    
+    def test_server_errors_count_as_failures(self):
+        """5xx responses count against the provider."""
+        for status_code in (500, 502, 503):
+            with self.subTest(status_code=status_code):
+                error = self.post_failing(_http_error(status_code))
+                
+                self.assertEqual(error.status_code, status_code)
+        self.assertEqual(self.breaker.failures, 3)
+    
+    def test_rate_limiting_counts_as_failure(self):
+        """A 429 response counts against the provider."""
+        self.post_failing(_http_error(429))
+        
+        self.assertEqual(self.breaker.failures, 1)
+    
+    def test_connection_errors_count_as_failures(self):
+        """Requests that get no response count against the provider."""
+        self.post_failing(requests.ConnectionError("connection refused"))
+        error = self.post_failing(requests.Timeout("read timed out"))
+        
+        self.assertIsNone(error.status_code)
+        self.assertEqual(self.breaker.failures, 2)
+    
+    def test_client_errors_count_as_success(self):
+        """4xx responses other than 429 show the provider is answering."""
+        self.post_failing(_http_error(500))
+        for status_code in (400, 401, 404):
+            with self.subTest(status_code=status_code):
+                self.post_failing(_http_error(status_code))
+                
+                self.assertEqual(self.breaker.failures, 0)
+    
+    def test_success_resets_failures(self):
+        """A successful request clears earlier failures."""
+        self.post_failing(_http_error(503))
+        self.session.post.side_effect = None
+        
+        self.client._post("https://example.invalid")
+        self.assertEqual(self.breaker.failures, 0)
+    
+    def test_open_breaker_refuses_without_sending(self):
+        """After fail_max failures in a row, requests fail without reaching the session."""
+        for _ in range(self.client.breaker_fail_max):
+            self.post_failing(_http_error(503))
+        self.session.post.reset_mock()
+        
+        error = self.post_failing(_http_error(503))
+        self.assertIn("requests paused", str(error))
+        self.session.post.assert_not_called()
+    
+    def test_client_errors_never_open_breaker(self):
+        """Any number of 4xx responses keeps requests flowing."""
+        for _ in range(self.client.breaker_fail_max * 2):
+            self.post_failing(_http_error(400))
+        
+        self.assertEqual(self.breaker.allow(), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
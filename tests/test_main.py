@@ -0,0 +1,73 @@
+"""
+Unit tests for the main entry point.
+Tests how source files passed with --file are read.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import main
+
+
+class TestReadSourceFile(unittest.TestCase):
+    """Test cases for _read_source_file."""
+    
+    def setUp(self):
+        """Create a temporary directory for the files under test."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def write(self, data: bytes) -> str:
+        path = os.path.join(self.tmpdir.name, "source.py")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+    
+    def test_utf8_text(self):
+        """UTF-8 text is returned as written."""
+        path = self.write("print('héllo')\n".encode("utf-8"))
+        
+        self.assertEqual(main._read_source_file(path), "print('héllo')\n")
+    
+    def test_empty_file(self):
+        """An empty file reads as an empty string."""
+        self.assertEqual(main._read_source_file(self.write(b"")), "")
+    
+    def test_line_endings_are_normalized(self):
+        """Windows and old Mac line endings both become \\n."""
+        path = self.write(b"a = 1\r\nb = 2\rc = 3\n")
+        
+        self.assertEqual(main._read_source_file(path), "a = 1\nb = 2\nc = 3\n")
+    
+    def test_invalid_utf8_raises(self):
+        """Bytes that are not UTF-8 are reported instead of replaced."""
+        path = self.write(b"name = '\xff'\n")
+        
+        with self.assertRaises(UnicodeDecodeError):
+            main._read_source_file(path)
+    
+    def test_memory_mapped_file(self):
+        """Files read through a memory map are decoded and normalized the same way."""
+        path = self.write(b"x = 1\r\n" * 10 + b"y = '\xc3\xa9'\r")
+        
+        with patch.object(main, "_MMAP_THRESHOLD", 1):
+            self.assertEqual(main._read_source_file(path), "x = 1\n" * 10 + "y = 'é'\n")
+    
+    def test_memory_mapped_invalid_utf8_raises(self):
+        """Invalid UTF-8 is reported for memory-mapped files too."""
+        path = self.write(b"\xff" * 16)
+        
+        with patch.object(main, "_MMAP_THRESHOLD", 1), self.assertRaises(UnicodeDecodeError):
+            main._read_source_file(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
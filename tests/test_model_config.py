@@ -0,0 +1,58 @@
+"""
+Unit tests for the model configuration.
+Tests that the cached lookups hand out data callers cannot modify.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from config import model_config
+
+
+class TestModelConfig(unittest.TestCase):
+    """Test cases for the model configuration getters."""
+    
+    def test_models_for_provider(self):
+        """A provider's models are returned in order, and unknown providers have none."""
+        models = model_config.get_models_for_provider("Claude")
+        
+        self.assertEqual(models[0]["id"], "claude-3-opus-20240229")
+        self.assertEqual(model_config.get_models_for_provider("unknown"), ())
+    
+    def test_model_list_cannot_be_modified(self):
+        """A caller cannot change the model list every other caller shares."""
+        models = model_config.get_models_for_provider("claude")
+        
+        with self.assertRaises(AttributeError):
+            models.append({"id": "injected"})
+        with self.assertRaises(TypeError):
+            models[0]["id"] = "changed"
+        self.assertEqual(model_config.get_models_for_provider("claude")[0]["id"], "claude-3-opus-20240229")
+    
+    def test_model_lookup_cannot_be_modified(self):
+        """A single model's information is read-only."""
+        model = model_config.get_model("openai", "gpt-4o")
+        
+        self.assertEqual(model["tokens"], 120000)
+        with self.assertRaises(TypeError):
+            model["tokens"] = 1
+        self.assertIsNone(model_config.get_model("openai", "unknown"))
+    
+    def test_defaults(self):
+        """Each provider's default model is its first one."""
+        self.assertEqual(model_config.get_default_model_for_provider("gemini"), "gemini-1.5-pro-latest")
+        self.assertEqual(model_config.get_default_model_for_provider("unknown"), "")
+    
+    def test_provider_settings_cannot_be_modified(self):
+        """Provider settings are read-only."""
+        with self.assertRaises(TypeError):
+            model_config.PROVIDER_SETTINGS["claude"]["api_version"] = "changed"
+
+
+if __name__ == '__main__':
+    unittest.main()
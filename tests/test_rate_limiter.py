@@ -0,0 +1,144 @@
+"""
+Unit tests for the client-side rate limiter.
+Tests TokenBucket bursts and refills, and how clients share buckets.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api_clients import create_api_client
+from src.api_clients import base_client
+from src.rate_limiter import TokenBucket
+from tests.helpers import FakeClock
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for TokenBucket."""
+    
+    def setUp(self):
+        """Give the bucket a clock that only moves when the test advances it."""
+        self.clock = FakeClock()
+        clock_patch = patch("src.rate_limiter.time", self.clock)
+        clock_patch.start()
+        self.addCleanup(clock_patch.stop)
+    
+    def test_burst_passes_without_waiting(self):
+        """A full bucket lets capacity requests through back to back."""
+        bucket = TokenBucket(rate=1.0, capacity=5)
+        
+        for _ in range(5):
+            self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(self.clock.sleeps, [])
+    
+    def test_request_past_burst_waits_for_refill(self):
+        """Once the burst is spent, a request waits until a token has been added."""
+        bucket = TokenBucket(rate=2.0, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        
+        self.assertAlmostEqual(bucket.acquire(), 0.5)
+        self.assertEqual(self.clock.sleeps, [0.5])
+    
+    def test_queued_requests_wait_in_turn(self):
+        """Requests past the burst are spaced one refill interval apart."""
+        bucket = TokenBucket(rate=4.0, capacity=1)
+        bucket.acquire()
+        # Taking tokens without time passing, as concurrent callers would
+        with patch.object(self.clock, "sleep"):
+            waits = [bucket.acquire() for _ in range(3)]
+        
+        for wait, expected in zip(waits, (0.25, 0.5, 0.75)):
+            self.assertAlmostEqual(wait, expected)
+    
+    def test_refill_over_time(self):
+        """Idle time refills the bucket at the configured rate."""
+        bucket = TokenBucket(rate=1.0, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        
+        self.clock.advance(2)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+    
+    def test_refill_is_capped_at_capacity(self):
+        """A long idle period refills no more than one full burst."""
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        self.clock.advance(3600)
+        
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertAlmostEqual(bucket.acquire(), 1.0)
+    
+    def test_acquire_several_tokens(self):
+        """Taking several tokens at once waits for all of them."""
+        bucket = TokenBucket(rate=1.0, capacity=2)
+        
+        self.assertAlmostEqual(bucket.acquire(5), 3.0)
+
+
+class TestSharedRateLimiters(unittest.TestCase):
+    """Test cases for the rate limiters BaseAPIClient._post draws from."""
+    
+    def setUp(self):
+        """Start with no rate limiters and a session that answers without a network."""
+        limiters_patch = patch.dict(base_client._RATE_LIMITERS, clear=True)
+        limiters_patch.start()
+        self.addCleanup(limiters_patch.stop)
+        breakers_patch = patch.dict(base_client._CIRCUIT_BREAKERS, clear=True)
+        breakers_patch.start()
+        self.addCleanup(breakers_patch.stop)
+        
+        session_patch = patch.object(base_client, "_SESSION", MagicMock())
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+        
+        self.clock = FakeClock()
+        clock_patch = patch("src.rate_limiter.time", self.clock)
+        clock_patch.start()
+        self.addCleanup(clock_patch.stop)
+    
+    def test_clients_with_same_key_share_a_bucket(self):
+        """Two clients of one provider and key draw from the same budget."""
+        first = create_api_client("claude", "shared_key")
+        second = create_api_client("claude", "shared_key")
+        first._post("https://example.invalid")
+        second._post("https://example.invalid")
+        
+        self.assertEqual(list(base_client._RATE_LIMITERS), [("ClaudeAPIClient", "shared_key")])
+        bucket = base_client._RATE_LIMITERS[("ClaudeAPIClient", "shared_key")]
+        self.assertEqual(bucket.tokens, first.request_burst - 2)
+    
+    def test_buckets_are_per_key_and_provider(self):
+        """Another API key or another provider gets a bucket of its own."""
+        create_api_client("claude", "key_a")._post("https://example.invalid")
+        create_api_client("claude", "key_b")._post("https://example.invalid")
+        create_api_client("gemini", "key_a")._post("https://example.invalid")
+        
+        self.assertEqual(set(base_client._RATE_LIMITERS), {
+            ("ClaudeAPIClient", "key_a"),
+            ("ClaudeAPIClient", "key_b"),
+            ("GeminiAPIClient", "key_a"),
+        })
+    
+    def test_shared_burst_throttles_every_client(self):
+        """A burst spent by one client makes another client with the same key wait."""
+        first = create_api_client("claude", "shared_key")
+        second = create_api_client("claude", "shared_key")
+        for _ in range(first.request_burst):
+            first._post("https://example.invalid")
+        self.assertEqual(self.clock.sleeps, [])
+        
+        second._post("https://example.invalid")
+        self.assertEqual(len(self.clock.sleeps), 1)
+        self.assertAlmostEqual(self.clock.sleeps[0], 60.0 / second.requests_per_minute)
+
+
+if __name__ == '__main__':
+    unittest.main()
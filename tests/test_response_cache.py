@@ -0,0 +1,208 @@
+"""
+Unit tests for the response caches.
+Tests lookups, expiry and eviction of the in-memory and SQLite caches.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.response_cache import DiskResponseCache, ResponseCache
+from tests.helpers import FakeClock
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the in-memory LRU cache."""
+    
+    def setUp(self):
+        """Give the cache a clock that only moves when the test advances it."""
+        self.clock = FakeClock()
+        clock_patch = patch("src.response_cache.time", self.clock)
+        clock_patch.start()
+        self.addCleanup(clock_patch.stop)
+    
+    def test_evicts_least_recently_used(self):
+        """A full cache evicts the entry that was used longest ago, not the oldest stored."""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", "response a")
+        cache.put("b", "response b")
+        # Reading "a" makes "b" the least recently used entry
+        self.assertEqual(cache.get("a"), "response a")
+        cache.put("c", "response c")
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "response a")
+        self.assertEqual(cache.get("c"), "response c")
+    
+    def test_put_refreshes_existing_key(self):
+        """Storing a key again replaces its response and marks it recently used."""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", "old")
+        cache.put("b", "response b")
+        cache.put("a", "new")
+        cache.put("c", "response c")
+        
+        self.assertEqual(cache.get("a"), "new")
+        self.assertIsNone(cache.get("b"))
+    
+    def test_ttl_expiry(self):
+        """A response is returned until its TTL runs out, then dropped."""
+        cache = ResponseCache(ttl=60)
+        cache.put("a", "response a")
+        
+        self.clock.advance(59.9)
+        self.assertEqual(cache.get("a"), "response a")
+        self.clock.advance(0.1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+    
+    def test_no_ttl_keeps_entries(self):
+        """With ttl=None a response stays until it is evicted."""
+        cache = ResponseCache(ttl=None)
+        cache.put("a", "response a")
+        
+        self.clock.advance(10 ** 9)
+        self.assertEqual(cache.get("a"), "response a")
+    
+    def test_clear(self):
+        """clear removes every cached response."""
+        cache = ResponseCache()
+        cache.put("a", "response a")
+        cache.clear()
+        
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+
+class TestMakeKey(unittest.TestCase):
+    """Test cases for the cache key built from a request."""
+    
+    def test_key_is_stable(self):
+        """The same request always gets the same key, across calls and processes."""
+        key = ResponseCache.make_key("ClaudeAPIClient", "model", "system", "prompt", 100)
+        
+        self.assertEqual(key, ResponseCache.make_key("ClaudeAPIClient", "model", "system", "prompt", 100))
+        # blake2b is not salted per process like hash(), so the digest is fixed
+        self.assertEqual(key, "032cfc77c19d9bcc445b7e2ce8d1f5d8")
+    
+    def test_message_key_ignores_dict_order(self):
+        """Conversations that differ only in key order within a message share a key."""
+        first = [{"role": "user", "content": "hi"}]
+        second = [{"content": "hi", "role": "user"}]
+        
+        self.assertEqual(
+            ResponseCache.make_key("p", "m", None, first, 100),
+            ResponseCache.make_key("p", "m", None, second, 100)
+        )
+    
+    def test_every_field_changes_the_key(self):
+        """Changing any part of the request gives a different key."""
+        base = ("provider", "model", "system", "prompt", 100)
+        keys = {ResponseCache.make_key(*base)}
+        for i, changed in enumerate(("other", "other", "other", "other", 200)):
+            fields = list(base)
+            fields[i] = changed
+            keys.add(ResponseCache.make_key(*fields))
+        
+        self.assertEqual(len(keys), 6)
+    
+    def test_fields_cannot_run_together(self):
+        """Text moved from one field to the next does not produce the same key."""
+        self.assertNotEqual(
+            ResponseCache.make_key("p", "m", "ab", "c", 100),
+            ResponseCache.make_key("p", "m", "a", "bc", 100)
+        )
+    
+    def test_missing_system_prompt_matches_empty(self):
+        """No system prompt and an empty one are the same request."""
+        self.assertEqual(
+            ResponseCache.make_key("p", "m", None, "prompt", 100),
+            ResponseCache.make_key("p", "m", "", "prompt", 100)
+        )
+
+
+class TestDiskResponseCache(unittest.TestCase):
+    """Test cases for the SQLite response cache."""
+    
+    def setUp(self):
+        """Create a cache in a temporary directory with a controllable clock."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "cache", "responses.sqlite3")
+        
+        self.clock = FakeClock()
+        clock_patch = patch("src.response_cache.time", self.clock)
+        clock_patch.start()
+        self.addCleanup(clock_patch.stop)
+    
+    def make_cache(self, **kwargs) -> DiskResponseCache:
+        cache = DiskResponseCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+    
+    def test_put_and_get(self):
+        """A stored response is returned for its key and nothing for other keys."""
+        cache = self.make_cache()
+        cache.put("a", "response a")
+        
+        self.assertEqual(cache.get("a"), "response a")
+        self.assertIsNone(cache.get("b"))
+    
+    def test_max_entries_evicts_oldest(self):
+        """Storing past max_entries evicts the oldest stored responses."""
+        cache = self.make_cache(max_entries=3)
+        for key in "abcde":
+            cache.put(key, f"response {key}")
+        
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("e"), "response e")
+    
+    def test_max_entries_applies_without_ttl(self):
+        """A cache that never expires entries is still bounded by max_entries."""
+        cache = self.make_cache(ttl=None, max_entries=10)
+        for i in range(50):
+            cache.put(str(i), "response")
+        
+        self.assertEqual(len(cache), 10)
+    
+    def test_expired_response_is_not_returned(self):
+        """A response is returned until its TTL runs out, and not after."""
+        cache = self.make_cache(ttl=60)
+        cache.put("a", "response a")
+        
+        self.clock.advance(59)
+        self.assertEqual(cache.get("a"), "response a")
+        self.clock.advance(2)
+        self.assertIsNone(cache.get("a"))
+    
+    def test_responses_survive_reopening(self):
+        """A new cache on the same file sees what an earlier one stored."""
+        first = self.make_cache()
+        first.put("a", "response a")
+        first.close()
+        
+        self.assertEqual(self.make_cache().get("a"), "response a")
+    
+    def test_close_then_reuse(self):
+        """A closed cache reopens its database on the next use."""
+        cache = self.make_cache()
+        cache.put("a", "response a")
+        cache.close()
+        
+        self.assertEqual(cache.get("a"), "response a")
+        cache.put("b", "response b")
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Unit tests for the similarity cache.
+Tests the match threshold, scope isolation and eviction of SemanticCache.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.semantic_cache import SemanticCache, cosine, embed
+
+PROMPT = "What is the capital of France?"
+# Rewordings that score just above and just below the default 0.92 threshold
+NEAR_ABOVE = "What is the capital city of France?"
+NEAR_BELOW = "What is a capital of France?"
+
+
+class TestSimilarity(unittest.TestCase):
+    """Test cases for the trigram vectors the cache compares."""
+    
+    def test_identical_texts_score_one(self):
+        """A text ignoring case and punctuation is identical to itself."""
+        self.assertAlmostEqual(cosine(embed(PROMPT), embed("what is the capital of france")), 1.0)
+    
+    def test_unrelated_texts_score_zero(self):
+        """Texts that share no trigrams have no similarity."""
+        self.assertEqual(cosine(embed("abc"), embed("xyz")), 0.0)
+    
+    def test_empty_text_has_no_vector(self):
+        """Text with no words embeds to an empty vector."""
+        self.assertEqual(embed("?!"), {})
+    
+    def test_threshold_pairs(self):
+        """The rewordings used below sit on either side of the default threshold."""
+        self.assertGreater(cosine(embed(PROMPT), embed(NEAR_ABOVE)), 0.92)
+        self.assertLess(cosine(embed(PROMPT), embed(NEAR_BELOW)), 0.92)
+        self.assertGreater(cosine(embed(PROMPT), embed(NEAR_BELOW)), 0.9)
+
+
+class TestSemanticCache(unittest.TestCase):
+    """Test cases for SemanticCache lookups."""
+    
+    def setUp(self):
+        """Create a cache with the default threshold holding one prompt."""
+        self.cache = SemanticCache()
+        self.cache.add("scope", PROMPT, "Paris")
+    
+    def test_match_just_above_threshold(self):
+        """A rewording scoring just above the threshold gets the cached response."""
+        self.assertEqual(self.cache.search("scope", NEAR_ABOVE), "Paris")
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 0})
+    
+    def test_no_match_just_below_threshold(self):
+        """A rewording scoring just below the threshold is a miss."""
+        self.assertIsNone(self.cache.search("scope", NEAR_BELOW))
+        self.assertEqual(self.cache.stats(), {"hits": 0, "misses": 1})
+    
+    def test_threshold_is_inclusive(self):
+        """A prompt scoring exactly the threshold counts as a match."""
+        score = cosine(embed(PROMPT), embed(NEAR_BELOW))
+        cache = SemanticCache(threshold=score)
+        cache.add("scope", PROMPT, "Paris")
+        
+        self.assertEqual(cache.search("scope", NEAR_BELOW), "Paris")
+    
+    def test_best_match_wins(self):
+        """When several cached prompts match, the most similar one answers."""
+        self.cache.add("scope", NEAR_ABOVE, "Paris, the city")
+        
+        self.assertEqual(self.cache.search("scope", "What is the capital city of France"), "Paris, the city")
+    
+    def test_scopes_are_isolated(self):
+        """A prompt cached under one scope is never returned for another."""
+        self.assertIsNone(self.cache.search("other scope", PROMPT))
+        
+        self.cache.add("other scope", PROMPT, "Paris, France")
+        self.assertEqual(self.cache.search("scope", PROMPT), "Paris")
+        self.assertEqual(self.cache.search("other scope", PROMPT), "Paris, France")
+    
+    def test_empty_prompt_is_not_cached(self):
+        """A prompt with no words is neither stored nor matched."""
+        self.cache.add("scope", "?!", "nothing")
+        
+        self.assertEqual(len(self.cache), 1)
+        self.assertIsNone(self.cache.search("scope", "?!"))
+    
+    def test_clear(self):
+        """clear removes every cached response."""
+        self.cache.clear()
+        
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.search("scope", PROMPT))
+
+
+class TestSemanticCacheEviction(unittest.TestCase):
+    """Test cases for the per-scope max_entries bound."""
+    
+    def test_evicts_least_recently_used(self):
+        """A full scope evicts the prompt that was matched or stored longest ago."""
+        cache = SemanticCache(max_entries=2)
+        cache.add("scope", "alpha", "a")
+        cache.add("scope", "bravo", "b")
+        # Matching "alpha" makes "bravo" the least recently used prompt
+        self.assertEqual(cache.search("scope", "alpha"), "a")
+        cache.add("scope", "charlie", "c")
+        
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.search("scope", "bravo"))
+        self.assertEqual(cache.search("scope", "alpha"), "a")
+        self.assertEqual(cache.search("scope", "charlie"), "c")
+    
+    def test_bound_is_per_scope(self):
+        """Filling one scope does not evict prompts from another."""
+        cache = SemanticCache(max_entries=1)
+        cache.add("first", "alpha", "a")
+        cache.add("second", "bravo", "b")
+        cache.add("second", "charlie", "c")
+        
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.search("first", "alpha"), "a")
+        self.assertIsNone(cache.search("second", "bravo"))
+
+
+if __name__ == '__main__':
+    unittest.main()
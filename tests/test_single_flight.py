@@ -0,0 +1,180 @@
+"""
+Unit tests for single_flight.
+Tests that identical concurrent generate calls share one provider request.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.api_clients import ProviderError, create_api_client
+from src.api_clients import base_client
+from src.api_clients.base_client import single_flight
+
+CALLERS = 8
+
+
+def _stream_response(text: str) -> MagicMock:
+    """Build a streamed Claude reply that carries one text delta."""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_lines.return_value = [
+        b'data: {"type":"content_block_delta","delta":{"text":"%s"}}' % text.encode()
+    ]
+    return response
+
+
+class SingleFlightTestCase(unittest.TestCase):
+    """Base for tests whose upstream call blocks until every caller has joined it."""
+    
+    def setUp(self):
+        """Count the callers joining a flight and hold the upstream call until released."""
+        self.release = threading.Event()
+        self.upstream_calls = 0
+        self.calls_lock = threading.Lock()
+        
+        join_patch = patch.object(base_client, "_join_flight", wraps=base_client._join_flight)
+        self.join = join_patch.start()
+        self.addCleanup(join_patch.stop)
+        
+        self.client = create_api_client("claude", "flight_test_key")
+        self.client.cache = None
+    
+    def enter_upstream(self):
+        """Record an upstream call and wait until the test releases it."""
+        with self.calls_lock:
+            self.upstream_calls += 1
+        self.assertTrue(self.release.wait(5), "upstream call was never released")
+    
+    def wait_for_joins(self, count: int):
+        """Wait until count callers have found or registered the flight."""
+        deadline = time.monotonic() + 5
+        while self.join.call_count < count:
+            self.assertLess(time.monotonic(), deadline, "callers never joined the flight")
+            time.sleep(0.01)
+    
+    def run_concurrently(self, call, count: int = CALLERS) -> list:
+        """
+        Make a call from several threads at once and collect what each got back.
+        
+        Returns:
+            One (result, exception) pair per thread.
+        """
+        outcomes = [None] * count
+        
+        def worker(index):
+            try:
+                outcomes[index] = (call(), None)
+            except Exception as e:
+                outcomes[index] = (None, e)
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        self.wait_for_joins(count)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return outcomes
+
+
+class TestSingleFlightClient(SingleFlightTestCase):
+    """Test cases for single_flight on a provider client with a stubbed _post."""
+    
+    def fake_post(self, *args, **kwargs):
+        self.enter_upstream()
+        return _stream_response("shared answer")
+    
+    def failing_post(self, *args, **kwargs):
+        self.enter_upstream()
+        raise ProviderError("Claude", "503 Service Unavailable", 503)
+    
+    def test_concurrent_identical_calls_send_one_request(self):
+        """Identical calls made while one is in flight all get its response."""
+        with patch.object(type(self.client), "_post", side_effect=self.fake_post):
+            outcomes = self.run_concurrently(lambda: self.client.generate_response("same prompt"))
+        
+        self.assertEqual(self.upstream_calls, 1)
+        self.assertEqual(outcomes, [("shared answer", None)] * CALLERS)
+        self.assertEqual(self.client._inflight, {})
+    
+    def test_leader_error_reaches_every_caller(self):
+        """An error from the shared request is reported to every caller."""
+        with patch.object(type(self.client), "_post", side_effect=self.failing_post):
+            outcomes = self.run_concurrently(lambda: self.client.generate_response("same prompt"))
+        
+        self.assertEqual(self.upstream_calls, 1)
+        responses = {response for response, _ in outcomes}
+        self.assertEqual(len(responses), 1)
+        self.assertIn("503 Service Unavailable", responses.pop())
+    
+    def test_different_calls_are_not_shared(self):
+        """Calls with different arguments each send their own request."""
+        prompts = iter(f"prompt {i}" for i in range(CALLERS))
+        lock = threading.Lock()
+        
+        def next_call():
+            with lock:
+                prompt = next(prompts)
+            return self.client.generate_response(prompt)
+        
+        with patch.object(type(self.client), "_post", side_effect=self.fake_post):
+            self.run_concurrently(next_call)
+        
+        self.assertEqual(self.upstream_calls, CALLERS)
+    
+    def test_finished_call_is_not_reused(self):
+        """A call made after the shared request finished sends a new one."""
+        self.release.set()
+        with patch.object(type(self.client), "_post", side_effect=self.fake_post):
+            self.client.generate_response("same prompt")
+            self.client.generate_response("same prompt")
+        
+        self.assertEqual(self.upstream_calls, 2)
+    
+    def test_async_callers_share_one_request(self):
+        """Identical async calls share a request with each other."""
+        async def call_concurrently():
+            tasks = [asyncio.create_task(self.client.agenerate_response("same prompt"))
+                     for _ in range(CALLERS)]
+            while self.join.call_count < CALLERS:
+                await asyncio.sleep(0.01)
+            self.release.set()
+            return await asyncio.gather(*tasks)
+        
+        with patch.object(type(self.client), "_post", side_effect=self.fake_post):
+            responses = asyncio.run(call_concurrently())
+        
+        self.assertEqual(self.upstream_calls, 1)
+        self.assertEqual(responses, ["shared answer"] * CALLERS)
+
+
+class TestSingleFlightDecorator(SingleFlightTestCase):
+    """Test cases for exceptions raised through single_flight."""
+    
+    def test_leader_exception_reaches_every_waiter(self):
+        """An exception raised by the shared call is raised in every waiting caller."""
+        error = RuntimeError("provider went away")
+        
+        @single_flight
+        def generate(client, prompt):
+            self.enter_upstream()
+            raise error
+        
+        outcomes = self.run_concurrently(lambda: generate(self.client, "same prompt"))
+        
+        self.assertEqual(self.upstream_calls, 1)
+        self.assertEqual(outcomes, [(None, error)] * CALLERS)
+        self.assertEqual(self.client._inflight, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
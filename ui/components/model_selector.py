@@ -5,6 +5,8 @@ import customtkinter as ctk
 from typing import Callable, Dict, Any, Optional
 
 from config.model_config import PROVIDERS, get_models_for_provider
+# Importing the settings loads the project's .env file, once per process
+from config.settings import ENV_PATH
 
 
 class ModelSelector:
@@ -171,17 +173,9 @@ class ModelSelector:
         )
         api_key_entry.pack(side="left")
         
-        # Try to load existing API key from environment
+        # Try to load existing API key from environment; the .env file was
+        # loaded with the settings, and saved keys are written to os.environ
         import os
-        from dotenv import load_dotenv
-        from pathlib import Path
-        
-        # Get the project root directory
-        project_root = Path(__file__).resolve().parent.parent.parent
-        env_path = project_root / '.env'
-        
-        # Load the .env file
-        load_dotenv(dotenv_path=env_path)
         
         # Get API key based on provider
         key_var_name = f"{self.current_provider.upper()}_API_KEY"
@@ -223,11 +217,7 @@ class ModelSelector:
             return
         
         try:
-            from pathlib import Path
-            
-            # Get the project root directory
-            project_root = Path(__file__).resolve().parent.parent.parent
-            env_path = project_root / '.env'
+            env_path = ENV_PATH
             
             # Load existing .env file or create new one
             env_vars = {}